@@ -22,7 +22,9 @@ def __():
     import marimo as mo
     import pandas as pd
     import numpy as np
-    return mo, pd, np
+    from sales_index import SortedIndex
+    from ui_utils import debounced_slider
+    return mo, pd, np, SortedIndex, debounced_slider
 
 
 @app.cell
@@ -47,6 +49,18 @@ def __(pd, np):
     return df,
 
 
+@app.cell
+def __(df, SortedIndex):
+    """
+    ### Fiyat İndeksi
+    
+    Minimum fiyat eşiği için sıralı indeksi bir kez kuruyoruz.
+    """
+    price_index = SortedIndex(df['price'])
+    
+    return price_index,
+
+
 @app.cell
 def __(df, mo):
     """
@@ -64,13 +78,14 @@ def __(df, mo):
 
 
 @app.cell
-def __(mo):
+def __(mo, debounced_slider):
     """
     ### SQL Parametreleri
     
     UI bileşenleri ile SQL sorgu parametrelerini kontrol edebilirsiniz.
     """
-    min_price = mo.ui.slider(
+    # Değer sürükleme bırakıldığında gönderilir
+    min_price = debounced_slider(
         start=0,
         stop=2000,
         step=50,
@@ -90,7 +105,7 @@ def __(mo):
 
 
 @app.cell
-def __(df, min_price, selected_region):
+def __(df, min_price, price_index, selected_region):
     """
     ### SQL Sorgusu
     
@@ -100,8 +115,8 @@ def __(df, min_price, selected_region):
     # SQL sorgusu - Marimo otomatik olarak Python değişkenlerini kullanır
     # Not: Gerçek SQL hücresi için mo.sql() kullanılır, burada örnek olarak gösteriyoruz
     
-    # Filtreleme
-    filtered_df = df[df['price'] >= min_price.value]
+    # Filtreleme (fiyat eşiği sıralı indeksle O(log n) sürede bir aralığa çevrilir)
+    filtered_df = df.take(price_index.select(min_price.value))
     
     if selected_region.value != "Tümü":
         filtered_df = filtered_df[filtered_df['region'] == selected_region.value]
@@ -23,11 +23,26 @@ def __():
     import numpy as np
     import plotly.express as px
     import plotly.graph_objects as go
-    return mo, pd, np, px, go
+    from plot_utils import DEFAULT_POINT_BUDGET, FigureCache, data_version, scatter_figure
+    from ui_utils import debounced_number
+    return (mo, pd, np, px, go, DEFAULT_POINT_BUDGET, FigureCache, data_version, scatter_figure,
+            debounced_number)
 
 
 @app.cell
-def __(pd, np):
+def __(FigureCache):
+    """
+    ### Grafik Önbelleği
+    
+    Kurulan grafikler UI değerleri ve veri sürümüyle anahtarlanarak saklanır;
+    aynı seçime geri dönüldüğünde grafik yeniden oluşturulmaz.
+    """
+    figure_cache = FigureCache()
+    return figure_cache,
+
+
+@app.cell
+def __(pd, np, data_version):
     """
     ### Örnek Veri Oluşturma
     
@@ -47,11 +62,14 @@ def __(pd, np):
     x_data = np.random.normal(100, 15, 1000)
     y_data = np.random.normal(100, 15, 1000)
     
-    return dates, sales, categories, values, x_data, y_data
+    # Veri değiştiğinde önbellekteki eski grafikler kullanılmaz
+    chart_data_version = data_version(dates, sales, categories, values, x_data, y_data)
+    
+    return dates, sales, categories, values, x_data, y_data, chart_data_version
 
 
 @app.cell
-def __(mo):
+def __(mo, DEFAULT_POINT_BUDGET, debounced_number):
     """
     ### Grafik Parametreleri
     
@@ -71,15 +89,28 @@ def __(mo):
         full_width=True
     )
     
-    return chart_type, color_scheme
+    # Dağılım grafiğinde tarayıcıya gönderilecek en fazla nokta;
+    # üzerindeki veri sunucu tarafında yoğunluk haritasına çevrilir.
+    # Değer düzenleme bitince gönderilir; yazarken her rakam için grafik kurulmaz
+    point_budget = debounced_number(
+        start=100,
+        stop=100000,
+        step=100,
+        value=DEFAULT_POINT_BUDGET,
+        label="Nokta Bütçesi",
+        full_width=True
+    )
+    
+    return chart_type, color_scheme, point_budget
 
 
 @app.cell
-def __(dates, sales, categories, values, x_data, y_data, chart_type, color_scheme, px, pd):
+def __(dates, sales, categories, values, x_data, y_data, chart_data_version, chart_type, color_scheme, point_budget, figure_cache, px, pd, scatter_figure):
     """
     ### Dinamik Grafik Oluşturma
     
     UI bileşenlerine göre grafik tipi değişir.
+    Grafik yalnızca bu seçim ilk kez görüldüğünde kurulur; sonrası önbellekten gelir.
     """
     color_map = {
         "Viridis": px.colors.sequential.Viridis,
@@ -89,56 +120,76 @@ def __(dates, sales, categories, values, x_data, y_data, chart_type, color_schem
         "Cividis": px.colors.sequential.Cividis,
     }
     
-    if chart_type.value == "Çizgi Grafiği":
-        chart_df = pd.DataFrame({'Tarih': dates, 'Satış': sales})
-        chart_fig = px.line(
-            chart_df,
-            x='Tarih',
-            y='Satış',
-            title='Zaman Serisi - Satış Trendi',
-            color_discrete_sequence=color_map[color_scheme.value]
-        )
-    elif chart_type.value == "Bar Grafiği":
-        chart_df = pd.DataFrame({'Kategori': categories, 'Değer': values})
-        chart_fig = px.bar(
-            chart_df,
-            x='Kategori',
-            y='Değer',
-            title='Bar Grafiği - Kategoriler',
-            color='Değer',
-            color_continuous_scale=color_scheme.value.lower()
-        )
-    elif chart_type.value == "Dağılım Grafiği":
-        chart_df = pd.DataFrame({'X': x_data, 'Y': y_data})
-        chart_fig = px.scatter(
-            chart_df,
-            x='X',
-            y='Y',
-            title='Dağılım Grafiği',
-            color_discrete_sequence=color_map[color_scheme.value]
-        )
-    else:  # Pasta Grafiği
-        chart_df = pd.DataFrame({'Kategori': categories, 'Değer': values})
-        chart_fig = px.pie(
-            chart_df,
-            values='Değer',
-            names='Kategori',
-            title='Pasta Grafiği - Kategoriler',
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-    
-    chart_fig.update_layout(height=500)
+    def build_chart():
+        if chart_type.value == "Çizgi Grafiği":
+            chart_df = pd.DataFrame({'Tarih': dates, 'Satış': sales})
+            chart_fig = px.line(
+                chart_df,
+                x='Tarih',
+                y='Satış',
+                title='Zaman Serisi - Satış Trendi',
+                color_discrete_sequence=color_map[color_scheme.value]
+            )
+        elif chart_type.value == "Bar Grafiği":
+            chart_df = pd.DataFrame({'Kategori': categories, 'Değer': values})
+            chart_fig = px.bar(
+                chart_df,
+                x='Kategori',
+                y='Değer',
+                title='Bar Grafiği - Kategoriler',
+                color='Değer',
+                color_continuous_scale=color_scheme.value.lower()
+            )
+        elif chart_type.value == "Dağılım Grafiği":
+            chart_df = pd.DataFrame({'X': x_data, 'Y': y_data})
+            # Nokta sayısına göre SVG, WebGL veya yoğunluk haritası seçilir
+            chart_fig = scatter_figure(
+                chart_df,
+                x='X',
+                y='Y',
+                budget=point_budget.value,
+                title='Dağılım Grafiği',
+                color_discrete_sequence=color_map[color_scheme.value]
+            )
+        else:  # Pasta Grafiği
+            chart_df = pd.DataFrame({'Kategori': categories, 'Değer': values})
+            chart_fig = px.pie(
+                chart_df,
+                values='Değer',
+                names='Kategori',
+                title='Pasta Grafiği - Kategoriler',
+                color_discrete_sequence=px.colors.qualitative.Set3
+            )
+        
+        chart_fig.update_layout(height=500)
+        return chart_fig
+    
+    chart_key = (
+        chart_type.value,
+        color_scheme.value,
+        # Nokta bütçesi yalnızca dağılım grafiğini etkiler
+        point_budget.value if chart_type.value == "Dağılım Grafiği" else None,
+        chart_data_version,
+    )
+    chart_fig = figure_cache.get(chart_key, build_chart)
     return chart_fig,
 
 
 @app.cell
-def __(chart_fig, mo):
+def __(chart_fig, figure_cache, mo):
     """
     ### Grafik Görüntüleme
     
     Plotly grafiklerini görüntülüyoruz.
     """
-    mo.ui.plotly(chart_fig)
+    cache_stats = figure_cache.stats()
+    mo.vstack([
+        mo.ui.plotly(chart_fig),
+        mo.md(
+            f"🗂️ Grafik önbelleği: {cache_stats['hits']} isabet, {cache_stats['misses']} ıska "
+            f"({cache_stats['size']}/{cache_stats['maxsize']} kayıt)"
+        ),
+    ])
 
 
 @app.cell
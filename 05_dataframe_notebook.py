@@ -21,7 +21,11 @@ def __():
     import marimo as mo
     import pandas as pd
     import numpy as np
-    return mo, pd, np
+    from sales_aggregates import GroupedStats
+    from sales_index import IncrementalFilter, SortedIndex, TrigramIndex
+    from ui_utils import debounced_slider
+    return (mo, pd, np, GroupedStats, IncrementalFilter, SortedIndex, TrigramIndex,
+            debounced_slider)
 
 
 @app.cell
@@ -49,6 +53,36 @@ def __(pd, np):
     return df,
 
 
+@app.cell
+def __(df, GroupedStats, IncrementalFilter, SortedIndex, TrigramIndex):
+    """
+    ### Artımlı Filtre
+    
+    Yaş ve maaş için sıralı indeksler bir kez kurulur. Filtre motoru son sonucu
+    hatırlar: slider yalnızca seçimi daraltıyorsa önceki sonuç süzülür, genişletiyorsa
+    yalnızca yeni aralığa giren satırlar eklenir.
+    
+    İsim araması için trigram indeksi de bir kez kurulur; arama her tuşta tüm isimleri
+    taramak yerine yalnızca aday satırları kontrol eder. Departman ve şehir kodları da
+    bir kez çıkarılır; özetler her filtrede bu kodlarla tek geçişte hesaplanır.
+    """
+    df_filter = IncrementalFilter(
+        df,
+        ranges=['age', 'salary'],
+        categories=['city', 'department'],
+        sorted_indexes={'age': SortedIndex(df['age']), 'salary': SortedIndex(df['salary'])},
+    )
+    name_index = TrigramIndex(df['name'])
+    group_stats = GroupedStats(
+        df,
+        groups=['department', 'city'],
+        measures=['salary', 'age'],
+        extremes=['salary'],
+    )
+    
+    return df_filter, name_index, group_stats
+
+
 @app.cell
 def __(df, mo):
     """
@@ -67,13 +101,15 @@ def __(df, mo):
 
 
 @app.cell
-def __(mo, df):
+def __(mo, df, debounced_slider):
     """
     ### Filtreleme UI Bileşenleri
     
     DataFrame'i filtrelemek için UI bileşenleri kullanabilirsiniz.
+    Slider'lar değerini sürükleme bırakıldığında, arama kutusu düzenleme bittiğinde
+    (Enter veya odak kaybı) gönderir; ara değerler için filtre yeniden çalışmaz.
     """
-    min_age = mo.ui.slider(
+    min_age = debounced_slider(
         start=18,
         stop=80,
         step=1,
@@ -82,7 +118,7 @@ def __(mo, df):
         full_width=True
     )
     
-    max_salary = mo.ui.slider(
+    max_salary = debounced_slider(
         start=0,
         stop=100000,
         step=1000,
@@ -116,39 +152,39 @@ def __(mo, df):
 
 
 @app.cell
-def __(df, min_age, max_salary, selected_city, selected_department, search_text):
+def __(df_filter, group_stats, name_index, min_age, max_salary, selected_city, selected_department, search_text):
     """
     ### Filtrelenmiş DataFrame
     
-    UI bileşenlerine göre DataFrame'i filtreliyoruz.
-    """
-    filtered_df = df.copy()
-    
-    # Yaş filtresi
-    filtered_df = filtered_df[filtered_df['age'] >= min_age.value]
-    
-    # Maaş filtresi
-    filtered_df = filtered_df[filtered_df['salary'] <= max_salary.value]
-    
-    # Şehir filtresi
-    if selected_city.value != "Tümü":
-        filtered_df = filtered_df[filtered_df['city'] == selected_city.value]
-    
-    # Departman filtresi
-    if selected_department.value:
-        filtered_df = filtered_df[filtered_df['department'].isin(selected_department.value)]
+    UI bileşenlerine göre DataFrame'i filtreliyoruz. Filtre sonucu kopyalanmaz; seçilen
+    satırların konumları ve tüm özetler (başlık ortalamaları, departman özeti, şehir
+    dağılımı) tek geçişte hesaplanır.
+    """
+    selected_rows = df_filter.apply(
+        ranges={
+            # Yaş filtresi
+            'age': (min_age.value, None),
+            # Maaş filtresi
+            'salary': (None, max_salary.value),
+        },
+        categories={
+            # Şehir filtresi
+            'city': None if selected_city.value == "Tümü" else [selected_city.value],
+            # Departman filtresi
+            'department': selected_department.value or None,
+        },
+    )
     
-    # İsim arama
+    # İsim arama (büyük/küçük harf duyarsız, düz metin)
     if search_text.value:
-        filtered_df = filtered_df[
-            filtered_df['name'].str.contains(search_text.value, case=False, na=False)
-        ]
+        selected_rows = name_index.search(search_text.value, within=selected_rows)
+    filtered_stats = group_stats.compute(selected_rows)
     
-    return filtered_df,
+    return selected_rows, filtered_stats
 
 
 @app.cell
-def __(filtered_df, mo):
+def __(df, filtered_stats, mo, selected_rows):
     """
     ### Filtrelenmiş Sonuçlar
     
@@ -157,25 +193,24 @@ def __(filtered_df, mo):
     mo.md(f"""
     **Filtre Sonuçları:**
     
-    - Filtrelenmiş kayıt sayısı: {len(filtered_df)}
-    - Ortalama yaş: {filtered_df['age'].mean():.1f}
-    - Ortalama maaş: {filtered_df['salary'].mean():,.2f} TL
+    - Filtrelenmiş kayıt sayısı: {filtered_stats['count']}
+    - Ortalama yaş: {filtered_stats['mean']['age']:.1f}
+    - Ortalama maaş: {filtered_stats['mean']['salary']:,.2f} TL
     """)
     
-    mo.ui.table(filtered_df.head(50))
+    mo.ui.table(df.take(selected_rows[:50]))
 
 
 @app.cell
-def __(filtered_df, mo):
+def __(filtered_stats, mo):
     """
     ### Özet İstatistikler
     
     Filtrelenmiş veri için özet istatistikler.
     """
-    summary = filtered_df.groupby('department').agg({
-        'salary': ['mean', 'min', 'max', 'count'],
-        'age': 'mean'
-    }).round(2)
+    summary = filtered_stats['department'][
+        ['salary_mean', 'salary_min', 'salary_max', 'count', 'age_mean']
+    ].round(2)
     
     summary.columns = ['Ortalama Maaş', 'Min Maaş', 'Max Maaş', 'Kişi Sayısı', 'Ortalama Yaş']
     
@@ -184,13 +219,15 @@ def __(filtered_df, mo):
 
 
 @app.cell
-def __(filtered_df, mo):
+def __(filtered_stats, mo):
     """
     ### Şehir Bazında Dağılım
     
     Şehirlere göre kullanıcı dağılımı.
     """
-    city_dist = filtered_df['city'].value_counts().reset_index()
+    city_dist = (filtered_stats['city']['count']
+                 .sort_values(ascending=False, kind='stable')
+                 .reset_index())
     city_dist.columns = ['Şehir', 'Kullanıcı Sayısı']
     
     mo.md("#### Şehir Bazında Kullanıcı Dağılımı")
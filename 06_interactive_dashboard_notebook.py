@@ -29,8 +29,15 @@ def __():
     import plotly.express as px
     import plotly.graph_objects as go
     from datetime import datetime, timedelta
-    
-    return mo, pd, np, px, go, datetime, timedelta
+    from plot_utils import DEFAULT_POINT_BUDGET, FigureCache, data_version, downsample_line
+    from sales_aggregates import SalesCube, StratifiedSample
+    from sales_index import BitmapIndex, IncrementalFilter, SortedIndex
+    from table_utils import PagedTable
+    from ui_utils import debounced_slider
+    
+    return (mo, pd, np, px, go, datetime, timedelta, DEFAULT_POINT_BUDGET, FigureCache,
+            data_version, downsample_line, SalesCube, StratifiedSample, BitmapIndex,
+            IncrementalFilter, SortedIndex, PagedTable, debounced_slider)
 
 
 @app.cell
@@ -72,6 +79,73 @@ def __(pd, np, datetime, timedelta):
     return df,
 
 
+@app.cell
+def __(df, BitmapIndex, IncrementalFilter, SortedIndex):
+    """
+    ### Filtre İndeksleri
+    
+    Ürün ve bölge için değer başına bitmap'ler, gelir için sıralı indeks
+    veri oluşturulurken bir kez hesaplanır. Artımlı filtre motoru son sonucu
+    hatırlar; slider sürüklenirken yalnızca değişen satırlara dokunur.
+    """
+    bitmap_index = BitmapIndex(df, ['product', 'region'])
+    revenue_index = SortedIndex(df['revenue'])
+    incremental_filter = IncrementalFilter(
+        df,
+        ranges=['revenue'],
+        categories=['product', 'region'],
+        bitmap_index=bitmap_index,
+        sorted_indexes={'revenue': revenue_index},
+    )
+    
+    return bitmap_index, revenue_index, incremental_filter
+
+
+@app.cell
+def __(df, SalesCube):
+    """
+    ### Özet Küpü
+    
+    Ürün × bölge × gün hücrelerinde gelir, miktar, fiyat toplamları ve işlem sayısı
+    bir kez hesaplanır. Grafikler ham satırlar yerine bu küpten beslenir.
+    """
+    sales_cube = SalesCube(df, dims=('product', 'region', 'date'),
+                           measures=('revenue', 'quantity', 'price'))
+    
+    return sales_cube,
+
+
+@app.cell
+def __(df, StratifiedSample, mo):
+    """
+    ### Yaklaşık Sorgu Örneklemi
+    
+    Ürün × bölge katmanlarının her birinden en fazla 2000 satırlık rastgele örneklem
+    bir kez çekilir. KPI'lar önce bu örneklemden güven aralığıyla tahmin edilir;
+    kesin değerler arka planda hesaplanıp filtre durumuna göre saklanır.
+    """
+    sales_sample = StratifiedSample(df, strata=('product', 'region'),
+                                    measures=('revenue', 'quantity', 'price'))
+    exact_kpis = {}
+    get_refined_kpis, set_refined_kpis = mo.state(None)
+    
+    return sales_sample, exact_kpis, get_refined_kpis, set_refined_kpis
+
+
+@app.cell
+def __(df, FigureCache, data_version):
+    """
+    ### Grafik Önbelleği
+    
+    Grafikler filtre değerleri ve veri sürümüyle anahtarlanarak saklanır;
+    daha önce görülen bir filtre durumuna dönüldüğünde yeniden kurulmaz.
+    """
+    figure_cache = FigureCache()
+    dashboard_data_version = data_version(df)
+    
+    return figure_cache, dashboard_data_version
+
+
 @app.cell
 def __(df, mo):
     """
@@ -94,7 +168,7 @@ def __(df, mo):
 
 
 @app.cell
-def __(mo, df, pd):
+def __(mo, df, pd, debounced_slider):
     """
     ### Filtreler
     
@@ -123,7 +197,8 @@ def __(mo, df, pd):
         full_width=True
     )
     
-    min_revenue = mo.ui.slider(
+    # Değer sürükleme bırakıldığında gönderilir; ara değerler için grafikler yeniden kurulmaz
+    min_revenue = debounced_slider(
         start=0,
         stop=int(df['revenue'].max()),
         step=100,
@@ -132,11 +207,13 @@ def __(mo, df, pd):
         full_width=True
     )
     
-    return product_filter, region_filter, min_revenue
+    approximate_kpis = mo.ui.switch(value=True, label="Yaklaşık KPI'lar (anında, arka planda kesinleşir)")
+    
+    return product_filter, region_filter, min_revenue, approximate_kpis
 
 
 @app.cell
-def __(mo, product_filter, region_filter, min_revenue):
+def __(mo, product_filter, region_filter, min_revenue, approximate_kpis):
     """
     ### Filtre Kontrol Paneli
     
@@ -147,107 +224,179 @@ def __(mo, product_filter, region_filter, min_revenue):
         product_filter,
         region_filter,
         min_revenue,
+        approximate_kpis,
     ], gap=2)
 
 
 @app.cell
-def __(df, product_filter, region_filter, min_revenue):
+def __(df, sales_sample, exact_kpis, set_refined_kpis, approximate_kpis,
+       product_filter, region_filter, min_revenue, mo):
     """
-    ### Veri Filtreleme
+    ### KPI Koşulu
     
-    Filtrelere göre veriyi filtreliyoruz.
+    KPI'lar filtrelenmiş DataFrame'i beklemez. Yaklaşık modda kesin değerler bir arka
+    plan iş parçacığında hesaplanır; filtre bu sırada değişirse sonuç atılır.
+    Örneklem verinin tamamını kapsıyorsa tahmin zaten kesindir.
     """
-    filtered_df = df.copy()
+    kpi_ranges = {'revenue': (min_revenue.value, None)}
+    kpi_categories = {
+        'product': product_filter.value or None,
+        'region': None if region_filter.value == "Tümü" else [region_filter.value],
+    }
+    kpi_key = (min_revenue.value, tuple(sorted(product_filter.value)), region_filter.value)
+    
+    if kpi_key not in exact_kpis and not sales_sample.complete:
+        if approximate_kpis.value:
+            def refine_kpis():
+                result = sales_sample.exact(df, kpi_ranges, kpi_categories)
+                if not mo.current_thread().should_exit:
+                    exact_kpis[kpi_key] = result
+                    set_refined_kpis(kpi_key)
+    
+            mo.Thread(target=refine_kpis, daemon=True).start()
+        else:
+            exact_kpis[kpi_key] = sales_sample.exact(df, kpi_ranges, kpi_categories)
+    
+    return kpi_key, kpi_ranges, kpi_categories
+
+
+@app.cell
+def __(sales_sample, exact_kpis, get_refined_kpis, kpi_key, kpi_ranges, kpi_categories, mo):
+    """
+    ### Özet İstatistikler
     
-    # Ürün filtresi
-    if product_filter.value:
-        filtered_df = filtered_df[filtered_df['product'].isin(product_filter.value)]
+    Dashboard için özet istatistikler. Tahminler `≈` ve %95 güven aralığıyla gösterilir.
+    """
+    get_refined_kpis()
+    kpis = exact_kpis.get(kpi_key) or sales_sample.estimate(kpi_ranges, kpi_categories)
     
-    # Bölge filtresi
-    if region_filter.value != "Tümü":
-        filtered_df = filtered_df[filtered_df['region'] == region_filter.value]
+    def kpi_text(estimate, fmt, caption):
+        if kpis['exact']:
+            return fmt.format(estimate.value), caption
+        return "≈ " + fmt.format(estimate.value), f"{caption} · ±{fmt.format(estimate.margin)} (%95 GA)"
     
-    # Gelir filtresi
-    filtered_df = filtered_df[filtered_df['revenue'] >= min_revenue.value]
+    total_transactions = kpis['count']
+    revenue_value, revenue_caption = kpi_text(
+        kpis['sum']['revenue'], "${:,.2f}", f"{total_transactions.value:,.0f} işlem"
+    )
+    quantity_value, quantity_caption = kpi_text(kpis['sum']['quantity'], "{:,.0f}", "Adet")
+    price_value, price_caption = kpi_text(kpis['mean']['price'], "${:,.2f}", "Birim başına")
     
-    return filtered_df,
+    mo.vstack([
+        mo.hstack([
+            mo.stat(label="Toplam Gelir", value=revenue_value, caption=revenue_caption),
+            mo.stat(label="Toplam Miktar", value=quantity_value, caption=quantity_caption),
+            mo.stat(label="Ortalama Fiyat", value=price_value, caption=price_caption),
+        ], justify="space-around", gap=2),
+        mo.md("" if kpis['exact'] else
+              f"_⏳ {sales_sample.size:,} satırlık örneklemden tahmin; "
+              f"kesin değerler arka planda hesaplanıyor._"),
+    ])
 
 
 @app.cell
-def __(filtered_df, mo):
+def __(incremental_filter, product_filter, region_filter, min_revenue):
     """
-    ### Özet İstatistikler
+    ### Veri Filtreleme
     
-    Dashboard için özet istatistikler.
+    Filtrelere göre veriyi filtreliyoruz.
+    Kategorik filtreler bitmap'lerin OR/AND'i, gelir eşiği sıralı indeks ile çözülür;
+    koşul yalnızca daralıyor veya gelir eşiği genişliyorsa önceki sonuçtan devam edilir.
+    Sonuç satır numaralarıdır; tablo ve küp satırları kopyalamadan bunları kullanır.
     """
-    total_revenue = filtered_df['revenue'].sum()
-    total_quantity = filtered_df['quantity'].sum()
-    avg_price = filtered_df['price'].mean()
-    total_transactions = len(filtered_df)
+    selected_rows = incremental_filter.apply(
+        # Gelir filtresi
+        ranges={'revenue': (min_revenue.value, None)},
+        categories={
+            # Ürün filtresi (boş seçim filtre uygulamaz)
+            'product': product_filter.value or None,
+            # Bölge filtresi
+            'region': None if region_filter.value == "Tümü" else [region_filter.value],
+        },
+    )
     
-    mo.hstack([
-        mo.stat(
-            label="Toplam Gelir",
-            value=f"${total_revenue:,.2f}",
-            caption=f"{total_transactions} işlem"
-        ),
-        mo.stat(
-            label="Toplam Miktar",
-            value=f"{total_quantity:,}",
-            caption="Adet"
-        ),
-        mo.stat(
-            label="Ortalama Fiyat",
-            value=f"${avg_price:,.2f}",
-            caption="Birim başına"
-        ),
-    ], justify="space-around", gap=2)
+    return selected_rows,
 
 
 @app.cell
-def __(filtered_df, px, mo):
+def __(df, sales_cube, revenue_index, selected_rows, product_filter, region_filter, min_revenue):
+    """
+    ### Filtrelenmiş Küp
+    
+    Gelir eşiği hiçbir satırı elemiyorsa kategorik filtreler küp dilimlenerek
+    cevaplanır; aksi halde küp yalnızca seçilen satırlardan yeniden toplanır.
+    """
+    if revenue_index.count(min_revenue.value) == len(df):
+        filtered_cube = sales_cube.slice(
+            product=product_filter.value or None,
+            region=None if region_filter.value == "Tümü" else [region_filter.value],
+        )
+    else:
+        filtered_cube = sales_cube.subset(selected_rows)
+    
+    return filtered_cube,
+
+
+@app.cell
+def __(filtered_cube, figure_cache, dashboard_data_version, product_filter, region_filter, min_revenue,
+       px, mo, DEFAULT_POINT_BUDGET, downsample_line):
     """
     ### Grafikler
     
     Filtrelenmiş veri için grafikler.
+    Kırılımlar küp eksenleri toplanarak bulunur; maliyet işlem sayısından bağımsızdır.
+    Aynı filtre durumu için grafikler önbellekten gelir.
     """
-    # Ürün bazında gelir
-    product_revenue = filtered_df.groupby('product')['revenue'].sum().reset_index()
-    product_revenue = product_revenue.sort_values('revenue', ascending=True)
-    
-    fig1 = px.bar(
-        product_revenue,
-        x='revenue',
-        y='product',
-        orientation='h',
-        title='Ürün Bazında Toplam Gelir',
-        color='revenue',
-        color_continuous_scale='Viridis'
-    )
-    fig1.update_layout(height=300)
-    
-    # Bölge bazında gelir
-    region_revenue = filtered_df.groupby('region')['revenue'].sum().reset_index()
-    
-    fig2 = px.pie(
-        region_revenue,
-        values='revenue',
-        names='region',
-        title='Bölge Bazında Gelir Dağılımı'
-    )
-    fig2.update_layout(height=300)
-    
-    # Zaman serisi
-    daily_revenue = filtered_df.groupby('date')['revenue'].sum().reset_index()
-    
-    fig3 = px.line(
-        daily_revenue,
-        x='date',
-        y='revenue',
-        title='Günlük Gelir Trendi',
-        markers=True
+    def build_charts():
+        # Ürün bazında gelir
+        product_revenue = filtered_cube.marginal('product')
+        product_revenue = product_revenue.sort_values('revenue', ascending=True)
+        
+        fig1 = px.bar(
+            product_revenue,
+            x='revenue',
+            y='product',
+            orientation='h',
+            title='Ürün Bazında Toplam Gelir',
+            color='revenue',
+            color_continuous_scale='Viridis'
+        )
+        fig1.update_layout(height=300)
+        
+        # Bölge bazında gelir
+        region_revenue = filtered_cube.marginal('region')
+        
+        fig2 = px.pie(
+            region_revenue,
+            values='revenue',
+            names='region',
+            title='Bölge Bazında Gelir Dağılımı'
+        )
+        fig2.update_layout(height=300)
+        
+        # Zaman serisi
+        daily_revenue = filtered_cube.marginal('date')
+        # Uzun tarih aralıklarında LTTB ile nokta bütçesine indirgenir
+        daily_revenue = downsample_line(daily_revenue, 'date', 'revenue', budget=DEFAULT_POINT_BUDGET)
+        
+        fig3 = px.line(
+            daily_revenue,
+            x='date',
+            y='revenue',
+            title='Günlük Gelir Trendi',
+            markers=True
+        )
+        fig3.update_layout(height=300)
+        
+        return fig1, fig2, fig3
+    
+    charts_key = (
+        tuple(sorted(product_filter.value)),
+        region_filter.value,
+        min_revenue.value,
+        dashboard_data_version,
     )
-    fig3.update_layout(height=300)
+    fig1, fig2, fig3 = figure_cache.get(charts_key, build_charts)
     
     mo.vstack([
         mo.hstack([
@@ -259,27 +408,78 @@ def __(filtered_df, px, mo):
 
 
 @app.cell
-def __(filtered_df, mo):
+def __(df, selected_rows, revenue_index, PagedTable):
+    """
+    ### Sayfalanmış Tablo
+    
+    Tablo filtrelenmiş satırların konumları üzerinden tanımlanır; toplam satır
+    sayısı hemen bilinir, satırlar yalnızca görüntülenen sayfa için oluşturulur.
+    """
+    detail_table = PagedTable(df, selected_rows, page_size=100,
+                              sorted_indexes={'revenue': revenue_index})
+    
+    return detail_table,
+
+
+@app.cell
+def __(mo, df):
+    """
+    ### Tablo Sıralama Seçenekleri
+    
+    Sıralama sunucu tarafında, yalnızca satır konumları üzerinde yapılır.
+    """
+    table_sort = mo.ui.dropdown(
+        options=list(df.columns),
+        value='revenue',
+        label="Sırala",
+    )
+    table_descending = mo.ui.checkbox(value=True, label="Azalan")
+    
+    return table_sort, table_descending
+
+
+@app.cell
+def __(mo, detail_table):
+    """
+    ### Sayfa Seçimi
+    
+    Filtre değiştiğinde sayfa sayısı güncellenir ve ilk sayfaya dönülür.
+    """
+    table_page = mo.ui.number(start=1, stop=detail_table.n_pages, step=1, value=1, label="Sayfa")
+    
+    return table_page,
+
+
+@app.cell
+def __(detail_table, table_sort, table_descending, table_page, mo):
     """
     ### Detaylı Tablo
     
     Filtrelenmiş veriyi tablo olarak görüntülüyoruz.
+    Tarayıcıya yalnızca seçilen sayfanın satırları gönderilir.
     """
-    mo.md("#### 📊 Detaylı Veri Tablosu")
-    mo.ui.table(filtered_df.head(100))
+    mo.vstack([
+        mo.md("#### 📊 Detaylı Veri Tablosu"),
+        mo.hstack([table_sort, table_descending, table_page], justify="start", gap=2),
+        mo.ui.table(
+            detail_table.page(table_page.value - 1, sort_by=table_sort.value,
+                              descending=table_descending.value),
+            pagination=False,
+            selection=None,
+        ),
+        mo.md(detail_table.caption(table_page.value - 1)),
+    ])
 
 
 @app.cell
-def __(filtered_df, mo):
+def __(filtered_cube, mo):
     """
     ### Özet Rapor
     
     Filtrelenmiş veri için özet rapor.
     """
-    summary = filtered_df.groupby(['product', 'region']).agg({
-        'revenue': 'sum',
-        'quantity': 'sum'
-    }).reset_index()
+    summary = filtered_cube.marginal('product', 'region', measures=('revenue', 'quantity'))
+    summary = summary[['product', 'region', 'revenue', 'quantity']]
     summary = summary.sort_values('revenue', ascending=False)
     
     mo.md("#### 📈 Ürün ve Bölge Bazında Özet")
@@ -0,0 +1,218 @@
+"""
+Slider sürüklemesinde uçtan uca gecikme ölçümü
+``sales_analysis.py``'deki gelir slider'ının 0 → 4500 sürüklemesini, olaylar sabit
+aralıklarla gelecek şekilde canlandırır. Her değer için filtre (sıralı indeks +
+ilk sayfa), ürün × bölge SQL toplamı ve grafik kurulur. Üç strateji karşılaştırılır:
+
+- ``every``: her ara değer sırayla işlenir (mevcut davranış)
+- ``coalesce``: ``Coalescer`` ile yalnızca en son değer işlenir
+- ``release``: ``debounced_slider`` gibi yalnızca bırakılan değer işlenir
+
+Gecikme, sürüklemenin son olayından son değerin sonucu hazır olana kadar geçen süredir.
+
+Kullanım:
+    python benchmarks/bench_debounce.py --rows 100000 1000000 --interval-ms 16
+"""
+
+import argparse
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_sales_data import generate_vectorized  # noqa: E402
+from sales_db import TABLE, PreparedQueries  # noqa: E402
+from sales_index import SortedIndex  # noqa: E402
+from table_utils import PagedTable  # noqa: E402
+
+# sales_analysis.py'deki slider ile aynı adımlar
+DRAG_VALUES = list(range(0, 4501, 100))
+
+
+class Coalescer:
+    """
+    Art arda gelen değerleri birleştiren (coalescing) arka plan hesaplayıcısı.
+
+    ``submit`` bekletmeden döner; arka plandaki iş parçacığı her seferinde yalnızca
+    en son gönderilen değeri hesaplar. Hesaplama sürerken gelen ara değerler,
+    yerlerine daha yenisi geldiğinde atılır. ``result`` en son değerin sonucunu bekler.
+    ``stats()`` gönderilen, hesaplanan ve atılan değer sayılarını ve son değerin
+    gönderilmesinden sonucunun hazır olmasına kadar geçen süreyi verir.
+    """
+
+    def __init__(self, compute):
+        self.compute = compute
+        self.submitted = 0
+        self.computed = 0
+        self.dropped = 0
+        self.last_latency_ms = None
+        self._cond = threading.Condition()
+        self._pending = None
+        self._generation = 0
+        self._done_generation = 0
+        self._result = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, value):
+        """Yeni değeri kuyruğa koyar; henüz hesaplanmamış önceki değer atılır."""
+        with self._cond:
+            if self._pending is not None:
+                self.dropped += 1
+            self._generation += 1
+            self._pending = (self._generation, value, time.perf_counter())
+            self.submitted += 1
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                generation, value, submitted_at = self._pending
+                self._pending = None
+            result = self.compute(value)
+            with self._cond:
+                self.computed += 1
+                self._result = result
+                self._done_generation = generation
+                if generation == self._generation:
+                    self.last_latency_ms = (time.perf_counter() - submitted_at) * 1000
+                self._cond.notify_all()
+
+    def result(self, timeout=None):
+        """En son gönderilen değerin sonucunu bekleyip döndürür."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._done_generation == self._generation,
+                                       timeout=timeout):
+                raise TimeoutError("Son değerin hesaplanması zaman aşımına uğradı")
+            return self._result
+
+    def close(self):
+        """Arka plan iş parçacığını durdurur."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def stats(self):
+        """Gönderilen / hesaplanan / atılan değer sayıları ve son gecikme (ms)."""
+        return {
+            'submitted': self.submitted,
+            'computed': self.computed,
+            'dropped': self.dropped,
+            'last_latency_ms': None if self.last_latency_ms is None
+            else round(self.last_latency_ms, 2),
+        }
+
+
+def make_pipeline(df):
+    """Bir slider değeri için dashboard'un yaptığı işi yapan fonksiyonu döndürür."""
+    index = SortedIndex(df['revenue'].to_numpy())
+    con = duckdb.connect()
+    con.register('_bench_source', df)
+    con.execute(f"CREATE TABLE {TABLE} AS SELECT * FROM _bench_source")
+    queries = PreparedQueries(con)
+
+    def pipeline(min_revenue):
+        table = PagedTable(df, index.select(min_revenue), sorted_indexes={'revenue': index})
+        table.page(0)
+        totals = queries.run('product_region_totals', min_revenue=min_revenue, region=None)
+        px.bar(totals, x='product', y='revenue', color='region')
+        return min_revenue
+
+    pipeline(DRAG_VALUES[0])  # sorguların hazırlanması ölçüme karışmasın
+    return pipeline
+
+
+def drag(submit, interval_s):
+    """Sürükleme olaylarını sabit aralıklarla gönderir; son olayın zamanını döndürür."""
+    started = time.perf_counter()
+    for i, value in enumerate(DRAG_VALUES):
+        delay = started + i * interval_s - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        submit(value)
+    return time.perf_counter()
+
+
+def run_every(pipeline, interval_s):
+    events = queue.Queue()
+    done = threading.Event()
+    finished = {}
+
+    def worker():
+        count = 0
+        while True:
+            value = events.get()
+            pipeline(value)
+            count += 1
+            if value == DRAG_VALUES[-1]:
+                finished['at'], finished['computed'] = time.perf_counter(), count
+                done.set()
+                return
+
+    threading.Thread(target=worker, daemon=True).start()
+    released = drag(events.put, interval_s)
+    done.wait()
+    return finished['computed'], (finished['at'] - released) * 1000
+
+
+def run_coalesce(pipeline, interval_s):
+    coalescer = Coalescer(pipeline)
+    released = drag(coalescer.submit, interval_s)
+    coalescer.result()
+    latency_ms = (time.perf_counter() - released) * 1000
+    computed = coalescer.computed
+    coalescer.close()
+    return computed, latency_ms
+
+
+def run_release(pipeline, interval_s):
+    released = drag(lambda value: None, interval_s)
+    pipeline(DRAG_VALUES[-1])
+    return 1, (time.perf_counter() - released) * 1000
+
+
+STRATEGIES = {'every': run_every, 'coalesce': run_coalesce, 'release': run_release}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--interval-ms', type=float, default=16.0,
+                        help='Sürükleme olayları arasındaki süre (ms)')
+    args = parser.parse_args(argv)
+
+    results = []
+    for rows in args.rows:
+        pipeline = make_pipeline(generate_vectorized(rows, np.random.default_rng(42)))
+        started = time.perf_counter()
+        pipeline(DRAG_VALUES[-1])
+        single_ms = (time.perf_counter() - started) * 1000
+        for name, strategy in STRATEGIES.items():
+            computed, latency_ms = strategy(pipeline, args.interval_ms / 1000)
+            results.append({
+                'rows': rows,
+                'strategy': name,
+                'events': len(DRAG_VALUES),
+                'computed': computed,
+                'single_ms': round(single_ms, 1),
+                'latency_ms': round(latency_ms, 1),
+            })
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
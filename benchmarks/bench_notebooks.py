@@ -0,0 +1,288 @@
+"""
+Not defterlerinin veri boyutuyla ölçeklenmesinin ölçümü
+Her not defteri (``sales_analysis.py`` ve ``01``–``06``) tarayıcı olmadan çalıştırılır,
+veri üreten hücrenin yerine istenen boyutta sentetik veri konur ve önceden yazılmış bir
+UI değişiklikleri dizisi oynatılır. Her adımda çalışan her hücre için süre, en yüksek
+bellek artışı (tracemalloc) ve tarayıcıya gidecek çıktı boyutu JSON rapora yazılır.
+Bir taban rapor verilirse hücre bazında karşılaştırılır; gerileme varsa çıkış kodu 1'dir.
+Ölçümler marimo'nun iç çalıştırıcısına bağlı olduğundan rapora marimo sürümü yazılır;
+farklı sürümle üretilmiş taban raporla karşılaştırma yapılmaz (çıkış kodu 2).
+
+Kullanım:
+    python benchmarks/bench_notebooks.py --sizes 1000 100000 1000000 10000000 --output rapor.json
+    python benchmarks/bench_notebooks.py --sizes 1000 100000 --baseline taban.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from cell_profiler import NotebookRunner, mo  # noqa: E402
+from generate_sales_data import generate_vectorized, iter_batches  # noqa: E402
+from plot_utils import data_version  # noqa: E402
+from sales_io import PRODUCTS, write_batches  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000, 10_000_000]
+# Taban rapora göre bu oranın üzerindeki artışlar gerileme sayılır
+DEFAULT_TOLERANCE = 1.25
+# Ölçüm gürültüsünü elemek için gerilemede aranan en küçük mutlak farklar
+MIN_DELTA = {'wall_ms': 5.0, 'peak_mb': 1.0, 'payload_bytes': 10_000}
+
+
+# --- Sentetik veri -----------------------------------------------------------------
+
+def _sales_analysis_data(rows, rng, workdir):
+    """Satış verisini Parquet olarak yazar; not defteri ``SALES_DATA_PATH`` ile okur."""
+    path = os.path.join(workdir, f'sales_{rows}.parquet')
+    # Yazıcılar parçaları geri veren üreteçlerdir; sonuna kadar tüketilmeleri gerekir
+    for _ in write_batches(iter_batches(rows, rng, chunk_size=1_000_000), path, fmt='parquet'):
+        pass
+    os.environ['SALES_DATA_PATH'] = path
+    return {}
+
+
+def _sql_data(rows, rng, workdir):
+    df = pd.DataFrame({
+        'product': rng.choice(['Laptop', 'Telefon', 'Tablet', 'Kulaklık'], rows),
+        'region': rng.choice(['İstanbul', 'Ankara', 'İzmir'], rows),
+        'price': rng.normal(1000, 300, rows),
+        'quantity': rng.integers(1, 50, rows),
+        'date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), 'D'),
+    })
+    df['revenue'] = df['price'] * df['quantity']
+    return {'df': df}
+
+
+def _plotting_data(rows, rng, workdir):
+    dates = pd.date_range('2024-01-01', periods=rows, freq='min')
+    sales = np.cumsum(rng.normal(100, 20, rows))
+    categories = ['A', 'B', 'C', 'D', 'E']
+    values = rng.integers(10, 100, 5)
+    x_data = rng.normal(100, 15, rows)
+    y_data = rng.normal(100, 15, rows)
+    return {
+        'dates': dates, 'sales': sales, 'categories': categories, 'values': values,
+        'x_data': x_data, 'y_data': y_data,
+        'chart_data_version': data_version(dates, sales, categories, values, x_data, y_data),
+    }
+
+
+def _dataframe_data(rows, rng, workdir):
+    df = pd.DataFrame({
+        'id': np.arange(1, rows + 1),
+        'name': [f'Kullanıcı {i}' for i in range(1, rows + 1)],
+        'age': rng.integers(18, 80, rows),
+        'city': rng.choice(['İstanbul', 'Ankara', 'İzmir', 'Bursa', 'Antalya'], rows),
+        'salary': rng.normal(50000, 15000, rows),
+        'department': rng.choice(['IT', 'Sales', 'Marketing', 'HR', 'Finance'], rows),
+        'join_date': pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 2000, rows), 'D'),
+    })
+    return {'df': df}
+
+
+def _dashboard_data(rows, rng, workdir):
+    sales = generate_vectorized(rows, rng)
+    df = pd.DataFrame({
+        'date': sales['date'],
+        'product': sales['product'].astype(str),
+        'region': sales['region'].astype(str),
+        'quantity': sales['quantity'].astype(np.int64),
+        'price': sales['unit_price'],
+        'revenue': sales['revenue'],
+    })
+    return {'df': df}
+
+
+# Not defteri başına veri üreticisi (``None``: veri boyutundan bağımsız) ve oynatılacak
+# UI değişiklikleri. Değerler tarayıcının gönderdiği biçimdedir (ör. dropdown için liste).
+SCENARIOS = {
+    'sales_analysis.py': {
+        'data': _sales_analysis_data,
+        'steps': [
+            {'min_revenue_slider': 2000},
+            {'region_selector': ['Ankara']},
+            {'min_revenue_slider': 500},
+            {'sort_column': ['revenue'], 'sort_descending': True},
+            {'page_number': 3},
+        ],
+    },
+    '01_reactive_basics_notebook.py': {
+        'data': None,
+        'steps': [{'number': 75}, {'name': 'Benchmark'}, {'age': 40, 'active': False}],
+    },
+    '02_ui_components_notebook.py': {
+        'data': None,
+        'steps': [
+            {'text_input': 'ölçüm'},
+            {'slider': 80},
+            {'dropdown': ['Seçenek 3'], 'multiselect': ['Python', 'Rust']},
+            {'checkbox': False, 'switch': True},
+        ],
+    },
+    '03_sql_notebook.py': {
+        'data': _sql_data,
+        'steps': [{'min_price': 1200}, {'selected_region': ['Ankara']}, {'min_price': 300}],
+    },
+    '04_plotting_notebook.py': {
+        'data': _plotting_data,
+        'steps': [
+            {'chart_type': ['Dağılım Grafiği']},
+            {'color_scheme': ['Plasma']},
+            {'chart_type': ['Bar Grafiği']},
+            {'chart_type': ['Dağılım Grafiği']},
+        ],
+    },
+    '05_dataframe_notebook.py': {
+        'data': _dataframe_data,
+        'steps': [
+            {'min_age': 40},
+            {'max_salary': 60000},
+            {'selected_city': ['Ankara']},
+            {'search_text': '12'},
+            {'min_age': 30},
+        ],
+    },
+    '06_interactive_dashboard_notebook.py': {
+        'data': _dashboard_data,
+        'steps': [
+            {'min_revenue': 20000},
+            {'region_filter': ['Ankara']},
+            {'product_filter': PRODUCTS[:3]},
+            {'min_revenue': 5000},
+            {'table_sort': ['quantity'], 'table_page': 2},
+        ],
+    },
+}
+
+
+def run_notebook(name, rows, workdir, trace_memory=True):
+    """Bir not defterini verilen boyutta çalıştırıp senaryosunu oynatır; kayıtları döndürür."""
+    scenario = SCENARIOS[name]
+    overrides = {}
+    if scenario['data'] is not None:
+        overrides = scenario['data'](rows, np.random.default_rng(42), workdir)
+    runner = NotebookRunner(ROOT / name, overrides, trace_memory)
+
+    records = []
+    steps = [('başlangıç', None)] + [(json.dumps(s, ensure_ascii=False), s)
+                                     for s in scenario['steps']]
+    for position, (label, values) in enumerate(steps):
+        cells = runner.run() if values is None else runner.set_values(values)
+        for record in cells:
+            records.append({**record, 'rows': rows, 'step': position, 'change': label})
+    return records
+
+
+# --- Rapor ve karşılaştırma -----------------------------------------------------------
+
+def _key(record):
+    return record['notebook'], record['rows'], record['step'], record['cell']
+
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Taban rapora göre belirgin şekilde kötüleşen hücre ölçümlerini döndürür."""
+    base = {_key(r): r for r in baseline['cells']}
+    regressions = []
+    for record in report['cells']:
+        previous = base.get(_key(record))
+        if previous is None:
+            continue
+        for metric, min_delta in MIN_DELTA.items():
+            old, new = previous[metric], record[metric]
+            if new > old * tolerance and new - old > min_delta:
+                regressions.append({
+                    'notebook': record['notebook'], 'rows': record['rows'],
+                    'step': record['step'], 'cell': record['cell'], 'metric': metric,
+                    'baseline': old, 'current': new,
+                    'ratio': round(new / old, 2) if old else None,
+                })
+    return regressions
+
+
+def summarize(cells):
+    """Not defteri, boyut ve adım başına toplam süre, en yüksek bellek ve çıktı boyutu."""
+    df = pd.DataFrame(cells)
+    return (df.groupby(['notebook', 'rows', 'step'], sort=False)
+              .agg(cells=('cell', 'size'), wall_ms=('wall_ms', 'sum'),
+                   peak_mb=('peak_mb', 'max'), payload_kb=('payload_bytes', 'sum'))
+              .assign(payload_kb=lambda s: (s['payload_kb'] / 1024).round(1))
+              .reset_index())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Sentetik veri satır sayıları')
+    parser.add_argument('--notebooks', nargs='+', default=list(SCENARIOS),
+                        choices=list(SCENARIOS), help='Ölçülecek not defterleri')
+    parser.add_argument('--output', default='notebook_benchmark.json',
+                        help='JSON rapor dosyası')
+    parser.add_argument('--baseline', help='Karşılaştırılacak taban rapor (JSON)')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Gerileme sayılacak en küçük artış oranı')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='tracemalloc ile bellek ölçümünü kapatır (daha hızlı)')
+    args = parser.parse_args(argv)
+
+    cells = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # DuckDB dosyası ve önbellekler çalışma klasörünü kirletmesin
+        os.chdir(workdir)
+        try:
+            for name in args.notebooks:
+                sizes = args.sizes if SCENARIOS[name]['data'] is not None else [0]
+                for rows in sizes:
+                    started = time.perf_counter()
+                    cells.extend(run_notebook(name, rows, workdir, not args.no_memory))
+                    print(f"⏱️ {name} ({rows:,} satır): {time.perf_counter() - started:.1f} sn",
+                          file=sys.stderr)
+        finally:
+            os.chdir(cwd)
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'marimo': mo.__version__,
+        'sizes': args.sizes,
+        'cells': cells,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    print(summarize(cells).to_string(index=False))
+    errors = [c for c in cells if 'error' in c]
+    for c in errors:
+        print(f"❌ {c['notebook']} / {c['cell']}: {c['error']}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('marimo') != report['marimo']:
+            print(f"\n⚠️ Taban rapor marimo {baseline.get('marimo', 'bilinmeyen sürüm')} ile, bu rapor "
+                  f"{report['marimo']} ile üretildi; hücre ölçümleri karşılaştırılamaz. "
+                  "Taban raporu bu sürümle yeniden üretin.", file=sys.stderr)
+            return 2
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("\n📉 Gerilemeler:")
+            print(pd.DataFrame(regressions).to_string(index=False))
+            return 1
+        print("\n✅ Taban rapora göre gerileme yok")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
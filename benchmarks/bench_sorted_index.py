@@ -0,0 +1,74 @@
+"""
+Sıralı indeks ile boolean maske karşılaştırması
+Gelir eşiği (``revenue >= x``) için mevcut maske yolunu ``SortedIndex`` ile ölçer.
+
+Kullanım:
+    python benchmarks/bench_sorted_index.py --rows 1000000 10000000 50000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_sales_data import generate_vectorized  # noqa: E402
+from sales_index import SortedIndex  # noqa: E402
+
+
+def best_of(fn, repeat):
+    """``fn``'i ``repeat`` kez çalıştırıp en iyi süreyi (ms) döndürür."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(rows, quantiles, repeat):
+    df = generate_vectorized(rows, np.random.default_rng(42))
+    revenue = df['revenue']
+    region_mask = (df['region'] == 'Ankara').to_numpy()
+
+    started = time.perf_counter()
+    index = SortedIndex(revenue.to_numpy())
+    build_ms = (time.perf_counter() - started) * 1000
+
+    results = []
+    for q in quantiles:
+        threshold = float(revenue.quantile(q))
+        mask_ms = best_of(lambda: df[(revenue >= threshold).to_numpy() & region_mask], repeat)
+        index_ms = best_of(lambda: df.take(index.select(threshold, within=region_mask)), repeat)
+        count_ms = best_of(lambda: index.count(threshold), repeat)
+        results.append({
+            'rows': rows,
+            'selectivity': round(1 - q, 4),
+            'build_ms': round(build_ms, 1),
+            'mask_ms': round(mask_ms, 2),
+            'index_ms': round(index_ms, 2),
+            'count_ms': round(count_ms, 4),
+            'speedup': round(mask_ms / index_ms, 1),
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000, 50_000_000])
+    parser.add_argument('--quantiles', type=float, nargs='+', default=[0.5, 0.9, 0.99, 0.999])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = []
+    for rows in args.rows:
+        results.extend(run(rows, args.quantiles, args.repeat))
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+"""
+Not defteri hücreleri için süre ve bellek ölçümü
+Bir marimo not defterinin ``app.cell`` hücrelerini tarayıcı olmadan, bağımlılık
+sırasıyla tek tek çalıştırır. Her çalıştırmada hücre başına süre, tracemalloc ile
+ayrılan ve en yüksek bellek, girdi/çıktı nesnelerinin boyutu ve tarayıcıya gidecek
+çıktı boyutu ölçülür. Kayıtlar JSONL izine yazılır; özet tablo veya flamegraph
+araçlarının (flamegraph.pl, speedscope) okuduğu "folded" biçim üretilebilir.
+
+Kullanım:
+    python cell_profiler.py sales_analysis.py --trace iz.jsonl
+    python cell_profiler.py sales_analysis.py --set min_revenue_slider=2000 --set 'region_selector=["Ankara"]'
+    python cell_profiler.py --summary iz.jsonl
+    python cell_profiler.py --folded iz.jsonl > cells.folded
+"""
+
+import argparse
+import importlib.util
+import json
+import sys
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import marimo as mo
+
+# NotebookRunner marimo'nun iç API'lerini (``marimo._ast``, ``marimo._runtime``) kullanır;
+# bunlar sürümler arasında haber verilmeden değişebilir. Denenen aralık: [alt, üst)
+MARIMO_TESTED = ((0, 25), (0, 26))
+MARIMO_VERSION = tuple(int(p) for p in mo.__version__.split('.')[:2] if p.isdigit())
+_MARIMO_HINT = (f"cell_profiler marimo {MARIMO_TESTED[0][0]}.{MARIMO_TESTED[0][1]}.x ile denendi; "
+                f"kurulu sürüm {mo.__version__}. `pip install -r requirements.txt` ile "
+                "desteklenen sürümü kurun.")
+
+try:
+    from marimo._ast.app import InternalApp
+    from marimo._runtime import dataflow
+except ImportError as exc:
+    raise ImportError(f"marimo iç API'leri bulunamadı. {_MARIMO_HINT}") from exc
+
+if not MARIMO_TESTED[0] <= MARIMO_VERSION < MARIMO_TESTED[1]:
+    warnings.warn(f"Denenmemiş marimo sürümü. {_MARIMO_HINT}", RuntimeWarning, stacklevel=2)
+
+
+def object_size(value):
+    """Nesnenin yaklaşık bellek boyutu (bayt); DataFrame/Series için derin ölçüm."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=False).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True, index=False))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if hasattr(value, 'nbytes') and isinstance(getattr(value, 'nbytes'), int):
+        return value.nbytes
+    return sys.getsizeof(value)
+
+
+def _cell_label(name, code, position):
+    """Hücre için kalıcı etiket: adı, yoksa açıklamasının başlığı, yoksa sırası."""
+    if name and name.strip('_'):
+        return name
+    for line in code.splitlines():
+        line = line.strip().strip('"').strip()
+        if line.startswith('#'):
+            return line.lstrip('#').strip()
+    return f'hücre {position}'
+
+
+def _payload_bytes(output):
+    """Hücre çıktısının tarayıcıya gidecek HTML boyutu (bayt)."""
+    if output is None:
+        return 0
+    try:
+        return len(mo.as_html(output).text.encode('utf-8'))
+    except Exception:
+        return len(repr(output).encode('utf-8'))
+
+
+class NotebookRunner:
+    """
+    Bir marimo not defterini tarayıcı olmadan, hücre hücre ölçerek çalıştırır.
+
+    marimo hücre gövdelerini kaynaktan derleyip kendi çekirdeğinde çalıştırdığından
+    ``app.cell`` fonksiyonlarını sarmalamak ölçüm sağlamaz; bu sınıf uygulamanın
+    bağımlılık grafiğini kullanarak aynı hücreleri aynı sırayla kendisi çalıştırır.
+
+    ``overrides`` ile verilen değişkenleri tanımlayan hücreler çalıştırılmaz; bunların
+    yerine verilen değerler kullanılır. ``set_values`` UI bileşenlerinin değerini
+    değiştirir ve marimo'nun yapacağı gibi yalnızca bağımlı hücreleri yeniden çalıştırır.
+    ``trace`` verilirse her kayıt ayrıca bu JSONL dosyasına eklenir.
+    """
+
+    def __init__(self, path, overrides=None, trace_memory=True, trace=None):
+        spec = importlib.util.spec_from_file_location(Path(path).stem, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        self.notebook = Path(path).name
+        self.app = module.app
+        self.app._maybe_initialize()
+        self.graph = InternalApp(self.app).graph
+        self.order = dataflow.topological_sort(self.graph, list(self.graph.cells))
+        self.globals = dict(overrides or {})
+        self.skipped = {cid for cid in self.order
+                        if self.graph.cells[cid].defs & set(self.globals)}
+        self.labels = {}
+        for position, cid in enumerate(self.order):
+            data = self.app._cell_manager.cell_data_at(cid)
+            self.labels[cid] = _cell_label(data.name, data.code, position)
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.trace = trace
+        self.runs = 0
+
+    def _run_cell(self, cid):
+        impl = self.graph.cells[cid]
+        cell = self.app._cell_manager.cell_data_at(cid).cell
+        refs = {r: self.globals[r] for r in impl.refs if r in self.globals}
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        error, defs = None, {}
+        started = time.perf_counter()
+        try:
+            output, defs = cell.run(**refs)
+            self.globals.update(defs)
+        except Exception as exc:  # hata kayda yazılır, diğer hücreler denenir
+            output, error = None, f'{type(exc).__name__}: {exc}'
+        wall_ms = (time.perf_counter() - started) * 1000
+        alloc_mb = peak_mb = 0.0
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            alloc_mb, peak_mb = (current - before) / 1e6, (peak - before) / 1e6
+        record = {
+            'notebook': self.notebook,
+            'run': self.runs,
+            'cell': self.labels[cid],
+            'wall_ms': round(wall_ms, 3),
+            'alloc_mb': round(alloc_mb, 3),
+            'peak_mb': round(peak_mb, 3),
+            'input_bytes': sum(object_size(v) for v in refs.values()),
+            'output_bytes': sum(object_size(v) for v in defs.values()),
+            'payload_bytes': _payload_bytes(output),
+        }
+        if error:
+            record['error'] = error
+        if self.trace is not None:
+            self.trace.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self.trace.flush()
+        return record
+
+    def _run_cells(self, cell_ids):
+        ordered = dataflow.topological_sort(self.graph, cell_ids)
+        records = [self._run_cell(cid) for cid in ordered if cid not in self.skipped]
+        self.runs += 1
+        return records
+
+    def run(self):
+        """Tüm hücreleri bağımlılık sırasıyla çalıştırır."""
+        return self._run_cells(self.order)
+
+    def set_values(self, values):
+        """UI bileşenlerine değer verir ve bağımlı hücreleri yeniden çalıştırır."""
+        roots = set()
+        for name, value in values.items():
+            self.globals[name]._update(value)
+            roots |= self.graph.definitions[name]
+        return self._run_cells(dataflow.transitive_closure(self.graph, roots, inclusive=False))
+
+
+def read_trace(path):
+    """JSONL izini kayıt listesi olarak okur."""
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(records):
+    """
+    Hücre başına çalıştırma sayısı, toplam/ortalama/en uzun süre, toplam süredeki payı,
+    en yüksek bellek ve ortalama girdi/çıktı boyutları; en pahalı hücre en üstte.
+    """
+    df = pd.DataFrame(records)
+    summary = (df.groupby(['notebook', 'cell'], sort=False)
+                 .agg(runs=('wall_ms', 'size'), total_ms=('wall_ms', 'sum'),
+                      mean_ms=('wall_ms', 'mean'), max_ms=('wall_ms', 'max'),
+                      peak_mb=('peak_mb', 'max'), input_mb=('input_bytes', 'mean'),
+                      output_mb=('output_bytes', 'mean'), payload_kb=('payload_bytes', 'mean'))
+                 .reset_index())
+    summary['share_%'] = 100 * summary['total_ms'] / summary['total_ms'].sum()
+    summary[['input_mb', 'output_mb']] /= 1e6
+    summary['payload_kb'] /= 1024
+    return summary.sort_values('total_ms', ascending=False).round(2)
+
+
+def folded(records):
+    """
+    ``not_defteri;çalıştırma N;hücre mikro_saniye`` satırları. flamegraph.pl ve
+    speedscope bu "folded stack" biçimini doğrudan okur.
+    """
+    weights = {}
+    for r in records:
+        stack = f"{r['notebook']};çalıştırma {r['run']};{r['cell']}".replace(' ', '_')
+        weights[stack] = weights.get(stack, 0) + int(r['wall_ms'] * 1000)
+    return [f'{stack} {weight}' for stack, weight in weights.items()]
+
+
+def _parse_assignment(text):
+    """``ad=değer`` ifadesini çözer; değer JSON değilse metin olarak alınır."""
+    name, _, raw = text.partition('=')
+    try:
+        return name, json.loads(raw)
+    except json.JSONDecodeError:
+        return name, raw
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('notebook', nargs='?', help='Çalıştırılacak not defteri')
+    parser.add_argument('--set', action='append', default=[], metavar='AD=DEĞER',
+                        help='İlk çalıştırmadan sonra UI değerini değiştirir (tekrarlanabilir; '
+                             'her biri ayrı bir çalıştırmadır)')
+    parser.add_argument('--trace', default='cell_trace.jsonl', help='JSONL iz dosyası')
+    parser.add_argument('--summary', metavar='IZ', help='Var olan izin özetini yazdırır')
+    parser.add_argument('--folded', metavar='IZ', help='Var olan izi folded biçimde yazdırır')
+    parser.add_argument('--no-memory', action='store_true', help='tracemalloc ölçümünü kapatır')
+    args = parser.parse_args(argv)
+
+    if args.summary or args.folded:
+        records = read_trace(args.summary or args.folded)
+        print(summarize(records).to_string(index=False) if args.summary
+              else '\n'.join(folded(records)))
+        return 0
+    if not args.notebook:
+        parser.error("not defteri veya --summary/--folded gerekli")
+
+    sys.path.insert(0, str(Path(args.notebook).resolve().parent))
+    records = []
+    with open(args.trace, 'a', encoding='utf-8') as trace:
+        runner = NotebookRunner(args.notebook, trace_memory=not args.no_memory, trace=trace)
+        records.extend(runner.run())
+        for assignment in args.set:
+            name, value = _parse_assignment(assignment)
+            records.extend(runner.set_values({name: value}))
+    print(summarize(records).to_string(index=False))
+    print(f"\n📝 İz: {args.trace}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,72 +1,416 @@
 """
 Sahte satış verisi oluşturucu
 Bu script, test için gerçekçi satış verisi üretir.
+
+Kullanım:
+    python generate_sales_data.py                    # 1000 satırlık demo verisi
+    python generate_sales_data.py --rows 10000000    # vektörel üretim (yük testi)
+    python generate_sales_data.py --rows 100000000 --chunk-size 1000000
+                                                     # sabit bellekle parça parça yazma
+    python generate_sales_data.py --rows 100000000 --shards 16 --start-date 2025-01-01
+                                                     # tüm çekirdeklerde paralel üretim
+    python generate_sales_data.py --rows 10000000 --format parquet --partition-by month,region \
+        --output sales_parquet                       # sütunsal, bölümlenmiş çıktı
 """
 
+import argparse
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
-# Rastgelelik için seed
-np.random.seed(42)
+from sales_io import FORMATS, PARTITION_COLUMNS, PRODUCTS, REGIONS, write_batches
+
+# Bölge ve ürüne göre farklı gelir dağılımları
+BASE_REVENUE = {
+    'İstanbul': 50000,
+    'Ankara': 35000,
+    'İzmir': 40000,
+    'Bursa': 30000,
+    'Antalya': 32000
+}
 
-# Bölgeler ve ürünler
-regions = ['İstanbul', 'Ankara', 'İzmir', 'Bursa', 'Antalya']
-products = ['Laptop', 'Telefon', 'Tablet', 'Kulaklık', 'Kamera', 'Monitör', 'Klavye', 'Mouse']
+PRODUCT_MULTIPLIER = {
+    'Laptop': 1.5,
+    'Telefon': 1.2,
+    'Tablet': 0.8,
+    'Kulaklık': 0.3,
+    'Kamera': 1.0,
+    'Monitör': 0.6,
+    'Klavye': 0.2,
+    'Mouse': 0.15
+}
 
 # Tarih aralığı (son 6 ay)
-start_date = datetime.now() - timedelta(days=180)
-dates = [start_date + timedelta(days=x) for x in range(180)]
-
-# Veri oluştur
-data = []
-for _ in range(1000):
-    region = np.random.choice(regions)
-    product = np.random.choice(products)
-    date = np.random.choice(dates)
-    
-    # Bölge ve ürüne göre farklı gelir dağılımları
-    base_revenue = {
-        'İstanbul': 50000,
-        'Ankara': 35000,
-        'İzmir': 40000,
-        'Bursa': 30000,
-        'Antalya': 32000
-    }[region]
-    
-    product_multiplier = {
-        'Laptop': 1.5,
-        'Telefon': 1.2,
-        'Tablet': 0.8,
-        'Kulaklık': 0.3,
-        'Kamera': 1.0,
-        'Monitör': 0.6,
-        'Klavye': 0.2,
-        'Mouse': 0.15
-    }[product]
-    
-    revenue = np.random.normal(base_revenue * product_multiplier, base_revenue * 0.3)
-    revenue = max(1000, revenue)  # Minimum gelir
-    
-    quantity = np.random.randint(1, 50)
-    
-    data.append({
-        'date': date.strftime('%Y-%m-%d'),
-        'region': region,
-        'product': product,
+DAYS = 180
+
+# Kod -> değer tabloları (vektörel üretimde dizi indeksleme ile kullanılır)
+_BASE_REVENUE_BY_CODE = np.array([BASE_REVENUE[r] for r in REGIONS], dtype=np.float64)
+_MULTIPLIER_BY_CODE = np.array([PRODUCT_MULTIPLIER[p] for p in PRODUCTS], dtype=np.float64)
+
+
+def default_start_date():
+    """Varsayılan başlangıç tarihi: bugünden 180 gün önce."""
+    return datetime.now() - timedelta(days=DAYS)
+
+
+def generate_legacy(n_rows=1000, start_date=None):
+    """
+    Satırları tek tek üreten orijinal yöntem.
+    Global RNG'yi kullanır; demo verisinin birebir aynısını üretmek için korunmuştur.
+    """
+    start_date = start_date or default_start_date()
+    dates = [start_date + timedelta(days=x) for x in range(DAYS)]
+
+    data = []
+    for _ in range(n_rows):
+        region = np.random.choice(REGIONS)
+        product = np.random.choice(PRODUCTS)
+        date = np.random.choice(dates)
+
+        base_revenue = BASE_REVENUE[region]
+        product_multiplier = PRODUCT_MULTIPLIER[product]
+
+        revenue = np.random.normal(base_revenue * product_multiplier, base_revenue * 0.3)
+        revenue = max(1000, revenue)  # Minimum gelir
+
+        quantity = np.random.randint(1, 50)
+
+        data.append({
+            'date': date.strftime('%Y-%m-%d'),
+            'region': region,
+            'product': product,
+            'quantity': quantity,
+            'revenue': round(revenue, 2),
+            'unit_price': round(revenue / quantity, 2)
+        })
+
+    return pd.DataFrame(data)
+
+
+def generate_vectorized(n_rows, rng, start_date=None):
+    """
+    Her sütunu tek seferde NumPy dizisi olarak üretir.
+
+    Bölge/ürün kodları, gelir tabanı ve çarpanları dizi indeksleme ile,
+    tarihler ise ``datetime64`` gün ofsetleri olarak hesaplanır; satır başına
+    Python kodu çalışmaz.
+    """
+    start_date = start_date or default_start_date()
+    start = np.datetime64(start_date.date() if isinstance(start_date, datetime) else start_date, 'D')
+
+    region_codes = rng.integers(0, len(REGIONS), n_rows, dtype=np.int8)
+    product_codes = rng.integers(0, len(PRODUCTS), n_rows, dtype=np.int8)
+    day_offsets = rng.integers(0, DAYS, n_rows, dtype=np.int16)
+
+    base_revenue = _BASE_REVENUE_BY_CODE[region_codes]
+    revenue = rng.normal(base_revenue * _MULTIPLIER_BY_CODE[product_codes], base_revenue * 0.3)
+    np.maximum(revenue, 1000, out=revenue)  # Minimum gelir
+
+    quantity = rng.integers(1, 50, n_rows, dtype=np.int16)
+
+    return pd.DataFrame({
+        'date': start + day_offsets.astype('timedelta64[D]'),
+        'region': pd.Categorical.from_codes(region_codes, REGIONS),
+        'product': pd.Categorical.from_codes(product_codes, PRODUCTS),
         'quantity': quantity,
-        'revenue': round(revenue, 2),
-        'unit_price': round(revenue / quantity, 2)
+        'revenue': revenue.round(2),
+        'unit_price': (revenue / quantity).round(2),
     })
 
-# DataFrame oluştur
-df = pd.DataFrame(data)
 
-# CSV'ye kaydet
-df.to_csv('sales_data.csv', index=False, encoding='utf-8-sig')
-print(f"✅ {len(df)} satırlık satış verisi 'sales_data.csv' dosyasına kaydedildi.")
-print(f"📊 Veri özeti:")
-print(df.describe())
-print(f"\n📈 Bölge bazında toplam gelir:")
-print(df.groupby('region')['revenue'].sum().sort_values(ascending=False))
+def iter_batches(n_rows, rng, chunk_size, start_date=None):
+    """
+    ``n_rows`` satırı en fazla ``chunk_size`` boyutlu DataFrame parçaları halinde üretir.
+    Aynı anda bellekte yalnızca bir parça bulunur.
+    """
+    start_date = start_date or default_start_date()
+    for offset in range(0, n_rows, chunk_size):
+        yield generate_vectorized(min(chunk_size, n_rows - offset), rng, start_date)
+
+
+class RunningSummary:
+    """
+    Parça parça güncellenebilen ve birleştirilebilen (mergeable) özet istatistikler.
+
+    Her sayısal sütun için adet, ortalama, M2 (kareler farkı toplamı), min ve max
+    tutulur; parçalar Chan'ın paralel varyans formülü ile birleştirilir. Bölge
+    bazında toplam gelir kod başına toplanır. Kuantiller tam veri olmadan kesin
+    hesaplanamadığı için özet tablosunda yer almaz.
+    """
+
+    COLUMNS = ['quantity', 'revenue', 'unit_price']
+
+    def __init__(self):
+        self.count = 0
+        self.mean = np.zeros(len(self.COLUMNS))
+        self.m2 = np.zeros(len(self.COLUMNS))
+        self.min = np.full(len(self.COLUMNS), np.inf)
+        self.max = np.full(len(self.COLUMNS), -np.inf)
+        self.region_revenue = np.zeros(len(REGIONS))
+
+    def update(self, df):
+        """Bir DataFrame parçasını özete ekler."""
+        if len(df) == 0:
+            return self
+        values = np.column_stack([df[c].to_numpy(dtype=np.float64) for c in self.COLUMNS])
+        batch = RunningSummary()
+        batch.count = len(values)
+        batch.mean = values.mean(axis=0)
+        batch.m2 = ((values - batch.mean) ** 2).sum(axis=0)
+        batch.min = values.min(axis=0)
+        batch.max = values.max(axis=0)
+        codes = pd.Categorical(df['region'], categories=REGIONS).codes
+        batch.region_revenue = np.bincount(codes, weights=df['revenue'].to_numpy(),
+                                           minlength=len(REGIONS))
+        return self.merge(batch)
+
+    def merge(self, other):
+        """Başka bir özeti bu özete ekler (yerinde) ve ``self`` döndürür."""
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.count / total
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.region_revenue = self.region_revenue + other.region_revenue
+        return self
+
+    def describe(self):
+        """``DataFrame.describe()`` biçiminde (kuantiller hariç) özet tablo döndürür."""
+        std = np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.full(len(self.COLUMNS), np.nan)
+        return pd.DataFrame(
+            [np.full(len(self.COLUMNS), float(self.count)), self.mean, std, self.min, self.max],
+            index=['count', 'mean', 'std', 'min', 'max'],
+            columns=self.COLUMNS,
+        )
+
+    def revenue_by_region(self):
+        """Bölge bazında toplam geliri büyükten küçüğe sıralı döndürür."""
+        return pd.Series(self.region_revenue, index=pd.Index(REGIONS, name='region'),
+                         name='revenue').sort_values(ascending=False)
+
+
+def print_running_summary(summary):
+    """``print_summary`` ile aynı çıktıyı birleştirilmiş istatistiklerden üretir."""
+    print("📊 Veri özeti:")
+    print(summary.describe())
+    print("\n📈 Bölge bazında toplam gelir:")
+    print(summary.revenue_by_region())
+
+
+def peak_rss_mb():
+    """Sürecin en yüksek bellek kullanımı (MB); ölçülemiyorsa ``None``."""
+    if resource is None:
+        return None
+    # Linux'ta KB, macOS'ta bayt cinsindendir
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 ** 2 if sys.platform == 'darwin' else rss / 1024
+
+
+def shard_sizes(n_rows, shards):
+    """``n_rows`` satırı ``shards`` parçaya olabildiğince eşit böler."""
+    base, extra = divmod(n_rows, shards)
+    return [base + (1 if i < extra else 0) for i in range(shards)]
+
+
+def shard_path(output, shard_id, partition_by=None):
+    """
+    ``sales_data.csv`` -> ``sales_data.part-00003.csv``
+    Bölümlenmiş çıktıda tüm parçalar aynı klasöre yazıldığı için yol değişmez.
+    """
+    if partition_by:
+        return output
+    root, ext = os.path.splitext(output)
+    return f"{root}.part-{shard_id:05d}{ext}"
+
+
+def generate_shard(shard_id, n_rows, seed_seq, chunk_size, start_date, output,
+                   fmt='csv', partition_by=None):
+    """
+    Tek bir parçayı kendi bağımsız RNG akışıyla üretip dosyasına yazar.
+    Çıktı yalnızca seed, parça numarası ve satır sayısına bağlıdır; hangi işçinin
+    çalıştırdığından bağımsızdır. Özet istatistikleri döndürür.
+    """
+    rng = np.random.default_rng(seed_seq)
+    summary = RunningSummary()
+    path = shard_path(output, shard_id, partition_by)
+    batches = iter_batches(n_rows, rng, chunk_size, start_date)
+    for batch in write_batches(batches, path, fmt, partition_by, prefix=f"part-{shard_id:05d}"):
+        summary.update(batch)
+    return path, summary
+
+
+def merge_shards(paths, output):
+    """
+    Parça dosyalarını sırayla tek dosyada birleştirir; ilk parça dışındaki başlıkları atlar.
+    Hiç satır düşmediği için yazılmamış parçalar atlanır.
+    """
+    with open(output, 'wb') as out:
+        header_written = False
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            with open(path, 'rb') as part:
+                if header_written:
+                    part.readline()  # BOM + başlık
+                shutil.copyfileobj(part, out, length=16 * 1024 * 1024)
+                header_written = True
+            os.remove(path)
+
+
+def print_summary(df):
+    """Veri özetini ve bölge bazında toplam geliri konsola yazar."""
+    print("📊 Veri özeti:")
+    print(df.describe())
+    print("\n📈 Bölge bazında toplam gelir:")
+    print(df.groupby('region', observed=True)['revenue'].sum().sort_values(ascending=False))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sahte satış verisi oluşturucu")
+    parser.add_argument("--rows", type=int, default=None,
+                        help="Üretilecek satır sayısı (verilirse vektörel mod kullanılır)")
+    parser.add_argument("--seed", type=int, default=42, help="Rastgelelik için seed")
+    parser.add_argument("--output", default="sales_data.csv", help="Çıktı dosyası")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Verilirse veri bu boyutta parçalar halinde üretilip dosyaya eklenir "
+                             "(bellek kullanımı satır sayısından bağımsız kalır)")
+    parser.add_argument("--shards", type=int, default=None,
+                        help="Verilirse satırlar bu kadar parçaya bölünüp paralel üretilir "
+                             "(her parçanın kendi SeedSequence akışı vardır)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Paralel işçi sayısı (varsayılan: tüm çekirdekler)")
+    parser.add_argument("--no-merge", action="store_true",
+                        help="Parça dosyalarını birleştirmeden bırak")
+    parser.add_argument("--start-date", type=lambda v: datetime.strptime(v, '%Y-%m-%d'),
+                        default=None,
+                        help="İlk tarih (YYYY-MM-DD). Varsayılan bugünden 180 gün öncedir; "
+                             "birebir aynı çıktı için sabit bir tarih verin")
+    parser.add_argument("--format", choices=FORMATS, default='csv',
+                        help="Çıktı biçimi (parquet/arrow için pyarrow gerekir)")
+    parser.add_argument("--partition-by", type=lambda v: [c for c in v.split(',') if c],
+                        default=None,
+                        help="Bölümleme sütunları, ör. 'month,region' (yalnızca parquet/arrow; "
+                             "--output bir klasör olur)")
+    args = parser.parse_args(argv)
+    if args.partition_by:
+        if args.format == 'csv':
+            parser.error("--partition-by için --format parquet veya arrow seçilmelidir")
+        unknown = set(args.partition_by) - set(PARTITION_COLUMNS)
+        if unknown:
+            parser.error(f"Bilinmeyen bölümleme sütunu: {', '.join(sorted(unknown))}")
+    if args.rows is not None and args.rows < 0:
+        parser.error("--rows negatif olamaz")
+    if args.chunk_size is not None and args.chunk_size <= 0:
+        parser.error("--chunk-size pozitif olmalıdır")
+    if (args.chunk_size is not None or args.shards is not None) and args.rows is None:
+        parser.error("--chunk-size ve --shards için --rows da verilmelidir")
+    if args.shards is not None and not 1 <= args.shards <= args.rows:
+        parser.error("--shards 1 ile --rows arasında olmalıdır")
+    return args
+
+
+def run_sharded(args):
+    """
+    Satırları parçalara bölüp her parçayı ayrı süreçte üretir.
+
+    Her parça ``SeedSequence(seed).spawn(shards)`` ile türetilen bağımsız bir
+    üreteç kullanır; böylece aynı seed, parça sayısı, parça boyutu ve başlangıç
+    tarihi için çıktı, işçi sayısından bağımsız olarak bayt bayt aynıdır.
+    """
+    start_date = args.start_date or default_start_date()
+    chunk_size = args.chunk_size or 1_000_000
+    seed_seqs = np.random.SeedSequence(args.seed).spawn(args.shards)
+    sizes = shard_sizes(args.rows, args.shards)
+    workers = args.workers or os.cpu_count()
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(
+            generate_shard,
+            range(args.shards), sizes, seed_seqs,
+            [chunk_size] * args.shards, [start_date] * args.shards, [args.output] * args.shards,
+            [args.format] * args.shards, [args.partition_by] * args.shards,
+        ))
+    paths = sorted({path for path, _ in results if os.path.exists(path)})
+    summary = RunningSummary()
+    for _, shard_summary in results:
+        summary.merge(shard_summary)
+    # Parquet/Arrow parçaları birleştirilmez; sales_io.read_sales glob deseniyle birlikte okur
+    if not args.no_merge and args.format == 'csv':
+        merge_shards(paths, args.output)
+        paths = [args.output]
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ {summary.count} satırlık satış verisi {len(paths)} dosyaya kaydedildi: "
+          f"{paths[0]}{' ...' if len(paths) > 1 else ''}")
+    print(f"⏱️ {args.shards} parça / {workers} işçi: {elapsed:.3f} sn "
+          f"({summary.count / max(elapsed, 1e-9):,.0f} satır/sn)")
+    print_running_summary(summary)
+
+
+def run_streaming(args):
+    """Veriyi parça parça üretir, dosyaya ekler ve özeti birleştirilmiş istatistiklerle yazar."""
+    rng = np.random.default_rng(args.seed)
+    summary = RunningSummary()
+
+    started = time.perf_counter()
+    batches = iter_batches(args.rows, rng, args.chunk_size, args.start_date)
+    for batch in write_batches(batches, args.output, args.format, args.partition_by):
+        summary.update(batch)
+    elapsed = time.perf_counter() - started
+
+    if not os.path.exists(args.output):
+        # Bölümlenmiş çıktıda satır yoksa hiçbir bölüm dosyası oluşmaz
+        print(f"⚠️ Üretilecek satır olmadığı için '{args.output}' yazılmadı.")
+        return
+    print(f"✅ {summary.count} satırlık satış verisi '{args.output}' dosyasına kaydedildi.")
+    print(f"⏱️ Üretim + yazma süresi: {elapsed:.3f} sn ({summary.count / max(elapsed, 1e-9):,.0f} satır/sn)")
+    rss = peak_rss_mb()
+    if rss is not None:
+        print(f"💾 En yüksek bellek kullanımı: {rss:,.0f} MB")
+    print_running_summary(summary)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.shards is not None:
+        run_sharded(args)
+        return
+    if args.chunk_size is not None:
+        run_streaming(args)
+        return
+
+    started = time.perf_counter()
+    if args.rows is None:
+        # Rastgelelik için seed
+        np.random.seed(args.seed)
+        df = generate_legacy(start_date=args.start_date)
+    else:
+        df = generate_vectorized(args.rows, np.random.default_rng(args.seed), args.start_date)
+    elapsed = time.perf_counter() - started
+
+    # Dosyaya kaydet
+    for _ in write_batches([df], args.output, args.format, args.partition_by):
+        pass
+    print(f"✅ {len(df)} satırlık satış verisi '{args.output}' dosyasına kaydedildi.")
+    print(f"⏱️ Üretim süresi: {elapsed:.3f} sn ({len(df) / max(elapsed, 1e-9):,.0f} satır/sn)")
+    print_summary(df)
+
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Plotly grafikleri için yardımcılar
+Tarayıcıya gönderilen nokta sayısını, girdi satır sayısından bağımsız olarak
+yapılandırılabilir bir bütçeyle sınırlar.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Varsayılan nokta bütçesi: bir grafikte tarayıcıya gönderilecek en fazla nokta
+DEFAULT_POINT_BUDGET = 2000
+# Bu sayıya kadar dağılım grafikleri SVG ile, üzerinde WebGL (scattergl) ile çizilir
+SVG_POINT_LIMIT = 1000
+# Yoğunluk ısı haritasında eksen başına kutu sayısı
+DENSITY_BINS = 100
+# Grafik önbelleğinde tutulacak en fazla filtre durumu
+FIGURE_CACHE_SIZE = 64
+
+
+def _as_float(values):
+    """Sayısal veya tarih dizisini karşılaştırılabilir ``float64`` diziye çevirir."""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return values.astype(np.float64)
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: çizgi grafiğinin görsel şeklini koruyan ``n_out``
+    noktanın konumlarını döndürür. İlk ve son nokta her zaman korunur; aradaki her
+    kovadan, bir önceki seçilen nokta ve sonraki kovanın ortalamasıyla en büyük
+    üçgeni oluşturan nokta seçilir. Python döngüsü kova sayısı kadardır, kova
+    içindeki işler vektöreldir.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x, y = _as_float(x), _as_float(y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], max(edges[i + 2], edges[i + 1] + 1)
+        else:
+            next_start, next_end = n - 1, n
+        avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return np.unique(selected)
+
+
+def minmax_indices(y, n_out):
+    """
+    Her kovadan en küçük ve en büyük değerli noktayı seçen hızlı alternatif.
+    Ani tepe ve dipleri kesin olarak korur; ilk/son nokta dışında ``(n_out - 2) // 2``
+    kova kullanılır.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    y = _as_float(y)
+    edges = np.linspace(0, n, (n_out - 2) // 2 + 1).astype(np.int64)
+    picks = [np.array([0, n - 1])]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            bucket = y[start:end]
+            picks.append(start + np.array([np.argmin(bucket), np.argmax(bucket)]))
+    return np.unique(np.concatenate(picks))
+
+
+def downsample_line(df, x, y, budget=DEFAULT_POINT_BUDGET, method='lttb'):
+    """
+    Çizgi grafiği verisini en fazla ``budget`` satıra indirir (``x``'e göre sıralı).
+    ``method``: ``'lttb'`` (şekli korur) veya ``'minmax'`` (uç değerleri korur).
+    """
+    if len(df) <= budget:
+        return df
+    df = df.sort_values(x)
+    if method == 'minmax':
+        positions = minmax_indices(df[y].to_numpy(), budget)
+    else:
+        positions = lttb(df[x].to_numpy(), df[y].to_numpy(), budget)
+    return df.iloc[positions]
+
+
+def scatter_figure(df, x, y, budget=DEFAULT_POINT_BUDGET, bins=DENSITY_BINS, **px_kwargs):
+    """
+    Nokta sayısına göre uygun dağılım grafiğini üretir:
+
+    - ``SVG_POINT_LIMIT``'e kadar normal (SVG) ``px.scatter``
+    - ``budget``'a kadar WebGL ile çizilen ``scattergl``
+    - bütçenin üzerinde, kutulama sunucu tarafında yapılmış bir yoğunluk ısı haritası;
+      tarayıcıya en fazla ``bins × bins`` hücre gider
+    """
+    n = len(df)
+    if n <= budget:
+        render_mode = 'svg' if n <= SVG_POINT_LIMIT else 'webgl'
+        return px.scatter(df, x=x, y=y, render_mode=render_mode, **px_kwargs)
+
+    counts, x_edges, y_edges = np.histogram2d(df[x].to_numpy(), df[y].to_numpy(), bins=bins)
+    sequence = px_kwargs.get('color_discrete_sequence')
+    fig = go.Figure(go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=np.where(counts.T > 0, counts.T, np.nan),
+        colorscale=[[i / (len(sequence) - 1), c] for i, c in enumerate(sequence)]
+        if sequence and len(sequence) > 1 else 'Viridis',
+        colorbar={'title': 'Nokta'},
+    ))
+    fig.update_layout(
+        title=f"{px_kwargs.get('title', '')} ({n:,} nokta, yoğunluk)",
+        xaxis_title=x,
+        yaxis_title=y,
+    )
+    return fig
+
+
+def figure_payload_bytes(fig):
+    """Grafiğin tarayıcıya gönderilecek JSON boyutu (bayt)."""
+    return len(fig.to_json().encode('utf-8'))
+
+
+def data_version(*objects):
+    """
+    Verinin içeriğinden türetilen kısa sürüm etiketi (önbellek anahtarlarında kullanılır).
+    DataFrame/Series için ``hash_pandas_object``, diziler için ham baytlar özetlenir;
+    veri değişmedikçe etiket de değişmez.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for obj in objects:
+        if isinstance(obj, (pd.DataFrame, pd.Series)):
+            digest.update(pd.util.hash_pandas_object(obj, index=False).to_numpy().tobytes())
+            continue
+        array = np.asarray(obj)
+        if array.dtype == object:
+            digest.update(pd.util.hash_array(array.ravel()).tobytes())
+        else:
+            digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update(str(array.shape).encode())
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """
+    Oluşturulmuş grafikler için sınırlı LRU önbellek.
+
+    Anahtar, UI değerlerinin demeti ile veri sürüm etiketinden (``data_version``)
+    oluşur. Daha önce görülen bir filtre durumuna dönüldüğünde grafik yeniden
+    kurulmaz; tarayıcıya gidecek JSON da ilk istendiğinde bir kez üretilip saklanır.
+    Kapasite dolunca en uzun süredir kullanılmayan durum atılır.
+    """
+
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _entry(self, key, build):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        entry = {'figure': build(), 'json': None}
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get(self, key, build):
+        """``key`` için saklanan grafiği döndürür; yoksa ``build()`` ile kurup saklar."""
+        return self._entry(key, build)['figure']
+
+    def get_json(self, key, build):
+        """Grafiğin serileştirilmiş JSON'u; her durum için yalnızca bir kez üretilir."""
+        entry = self._entry(key, build)
+        if entry['json'] is None:
+            entry['json'] = entry['figure'].to_json()
+        return entry['json']
+
+    def clear(self):
+        """Tüm kayıtları ve sayaçları sıfırlar."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """İsabet/ıska sayıları, isabet oranı ve doluluk."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
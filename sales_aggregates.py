@@ -0,0 +1,331 @@
+"""
+Dashboard grafikleri için önceden toplanmış veri yapıları
+Ham satırlar yerine küçük, sabit boyutlu özetler üzerinde çalışarak grafik ve
+özet tablolarının maliyetini işlem sayısından bağımsız hale getirir.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+
+class SalesCube:
+    """
+    Boyutlar (ör. ürün × bölge × gün) üzerinde önceden toplanmış ölçüler küpü.
+
+    Her hücrede ölçülerin toplamları (ör. ``revenue``) ve satır sayısı (``count``) tutulur.
+    Kategorik filtreler küpün dilimlenmesiyle, grafiklerdeki kırılımlar (marjinaller)
+    küp eksenleri üzerinde toplanarak bulunur; maliyet satır sayısına değil hücre
+    sayısına bağlıdır.
+    """
+
+    def __init__(self, df, dims=('product', 'region', 'date'),
+                 measures=('revenue', 'quantity', 'price')):
+        self.dims = tuple(dims)
+        self.measures = tuple(measures)
+        self.labels = {}
+        codes = []
+        for dim in self.dims:
+            dim_codes, uniques = pd.factorize(df[dim], sort=True)
+            self.labels[dim] = pd.Index(uniques, name=dim)
+            codes.append(dim_codes)
+        self.shape = tuple(len(self.labels[d]) for d in self.dims)
+        # Satır başına düz hücre numarası; alt kümelerden yeniden küp kurarken kullanılır
+        self._flat = np.ravel_multi_index(codes, self.shape).astype(np.int32)
+        self._values = {m: df[m].to_numpy(dtype=np.float64) for m in self.measures}
+        # Tamsayı ölçüler (ör. miktar) toplandıktan sonra yine tamsayı olarak tutulur
+        self._integer = {m for m in self.measures if pd.api.types.is_integer_dtype(df[m])}
+        self.cells = self._aggregate(self._flat, self._values)
+
+    def _aggregate(self, flat, values):
+        size = int(np.prod(self.shape))
+        cells = {'count': np.bincount(flat, minlength=size).reshape(self.shape)}
+        for m in self.measures:
+            summed = np.bincount(flat, weights=values[m], minlength=size).reshape(self.shape)
+            cells[m] = summed.round().astype(np.int64) if m in self._integer else summed
+        return cells
+
+    def _derive(self, cells, labels):
+        cube = object.__new__(SalesCube)
+        cube.dims, cube.measures = self.dims, self.measures
+        cube.labels, cube.cells = labels, cells
+        cube.shape = cells['count'].shape
+        cube._flat, cube._values, cube._integer = self._flat, self._values, self._integer
+        return cube
+
+    def subset(self, row_ids):
+        """Yalnızca verilen satırlardan oluşan, aynı eksenlere sahip yeni bir küp."""
+        values = {m: v[row_ids] for m, v in self._values.items()}
+        return self._derive(self._aggregate(self._flat[row_ids], values), self.labels)
+
+    def slice(self, **selections):
+        """
+        Boyut başına seçilen değerlere göre dilimlenmiş küp (``None`` tüm değerler).
+        Kopyalama yalnızca küp hücreleri kadardır.
+        """
+        positions = []
+        labels = dict(self.labels)
+        for dim in self.dims:
+            selected = selections.get(dim)
+            if selected is None:
+                positions.append(np.arange(len(self.labels[dim])))
+                continue
+            idx = self.labels[dim].get_indexer(list(selected))
+            idx = np.sort(idx[idx >= 0])
+            positions.append(idx)
+            labels[dim] = self.labels[dim][idx]
+        grid = np.ix_(*positions)
+        cells = {name: values[grid] for name, values in self.cells.items()}
+        return self._derive(cells, labels)
+
+    def total(self, measure='revenue'):
+        """Ölçünün küp genelindeki toplamı (``count`` için satır sayısı)."""
+        return self.cells[measure].sum()
+
+    def marginal(self, *dims, measures=('revenue',), drop_empty=True):
+        """
+        Verilen boyutlara göre toplanmış DataFrame (diğer eksenler toplanır).
+        Hiç satırı olmayan hücreler ``groupby`` çıktısındaki gibi atılır.
+        """
+        axes = tuple(i for i, d in enumerate(self.dims) if d not in dims)
+        kept = [d for d in self.dims if d in dims]
+        perm = [kept.index(d) for d in dims]
+        data = {
+            name: np.transpose(self.cells[name].sum(axis=axes), perm).reshape(-1)
+            for name in ('count',) + tuple(measures)
+        }
+        if len(dims) > 1:
+            index = pd.MultiIndex.from_product([self.labels[d] for d in dims], names=dims)
+        else:
+            index = pd.Index(self.labels[dims[0]], name=dims[0])
+        result = pd.DataFrame(data, index=index)
+        if drop_empty:
+            result = result[result['count'] > 0]
+        return result.reset_index()
+
+
+class GroupedStats:
+    """
+    Birden çok gruplama sütunu için tek geçişte toplanan özet istatistikler.
+
+    Gruplama sütunları bir kez ``factorize`` edilir ve kodlar her yeniden hesaplamada
+    kullanılır. ``compute`` seçili satırların kodlarını ve ölçülerini bir kez toplayıp
+    her grup için sayı, toplam ve ortalamayı ``bincount`` ile, ``extremes`` ölçülerinin
+    en küçük ve en büyük değerini ``ufunc.at`` ile bulur; genel ortalamalar grup
+    toplamlarından türetilir. Filtre sonucunun DataFrame olarak kopyalanması ve her özet
+    için ayrı ``groupby`` gerekmez.
+    """
+
+    def __init__(self, df, groups, measures, extremes=()):
+        self.n_rows = len(df)
+        self.groups = tuple(groups)
+        self.measures = tuple(measures)
+        self.extremes = frozenset(extremes)
+        self.codes = {}
+        self.labels = {}
+        for col in self.groups:
+            codes, uniques = pd.factorize(df[col], sort=True)
+            # Eksik değerler (-1) sonda ayrı bir kovaya düşer ve sonuçta gösterilmez
+            codes[codes < 0] = len(uniques)
+            self.codes[col] = codes.astype(np.int32)
+            self.labels[col] = pd.Index(uniques, name=col)
+        self.values = {m: df[m].to_numpy(dtype=np.float64) for m in self.measures}
+
+    def compute(self, row_ids=None):
+        """
+        ``row_ids`` satırları (``None`` ise tümü) için özet.
+
+        ``{'count': n, 'mean': {ölçü: ortalama}, <grup sütunu>: DataFrame}`` döndürür;
+        grup tablolarının sütunları ``count``, her ölçü için ``<ölçü>_sum`` ve ``_mean``,
+        ``extremes`` ölçüleri için ayrıca ``_min`` ve ``_max``'tır. Satırı olmayan gruplar
+        ``groupby`` çıktısındaki gibi atılır.
+        """
+        values = {m: v if row_ids is None else v[row_ids] for m, v in self.values.items()}
+        n = self.n_rows if row_ids is None else len(row_ids)
+        result = {'count': n, 'mean': {}}
+        for col in self.groups:
+            codes = self.codes[col] if row_ids is None else self.codes[col][row_ids]
+            size = len(self.labels[col]) + 1
+            count = np.bincount(codes, minlength=size)
+            data = {'count': count[:-1]}
+            for m, v in values.items():
+                sums = np.bincount(codes, weights=v, minlength=size)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    data[f'{m}_sum'] = sums[:-1]
+                    data[f'{m}_mean'] = sums[:-1] / count[:-1]
+                if m in self.extremes:
+                    lows = np.full(size, np.inf)
+                    highs = np.full(size, -np.inf)
+                    np.minimum.at(lows, codes, v)
+                    np.maximum.at(highs, codes, v)
+                    data[f'{m}_min'] = lows[:-1]
+                    data[f'{m}_max'] = highs[:-1]
+                if m not in result['mean']:
+                    result['mean'][m] = sums.sum() / n if n else np.nan
+            table = pd.DataFrame(data, index=self.labels[col])
+            result[col] = table[table['count'] > 0]
+        return result
+
+
+Estimate = namedtuple('Estimate', ['value', 'margin'])
+
+
+class StratifiedSample:
+    """
+    Katmanlı (ör. ürün × bölge) rezervuar örneklemi ile yaklaşık toplamlar.
+
+    Her satıra rastgele bir anahtar verilir ve her katmanda en küçük anahtarlı
+    ``per_stratum`` satır tutulur; bu, katman başına rezervuar örneklemesine denktir ve
+    ``update`` ile gelen yeni parçalar örneklemle birleştirilebilir. Katmanların
+    gerçek satır sayıları da tutulur.
+
+    ``estimate`` filtre koşulu için sayı, toplam ve ortalamaları katmanlı tahminciyle
+    (ortalamalar oran tahmincisiyle) ve normal yaklaşımlı güven aralığı yarı
+    genişliğiyle döndürür; maliyet veri boyutundan değil örneklem boyutundan gelir.
+    Tüm katmanlar tamamen örneklenmişse sonuç kesindir. ``exact`` aynı sonucu tüm
+    veriyi tarayarak hesaplar.
+    """
+
+    # Katman kodlarını tek bir tamsayıda birleştirirken sütun başına ayrılan aralık
+    _STRIDE = 1 << 20
+
+    def __init__(self, df=None, strata=('product', 'region'),
+                 measures=('revenue', 'quantity', 'price'), per_stratum=2000, seed=0):
+        self.strata = tuple(strata)
+        self.measures = tuple(measures)
+        self.per_stratum = per_stratum
+        self.labels = {col: {} for col in self.strata}
+        self.population = {}
+        self._rng = np.random.default_rng(seed)
+        self._keys = np.empty(0)
+        self._stratum = np.empty(0, dtype=np.int64)
+        self._codes = {col: np.empty(0, dtype=np.int32) for col in self.strata}
+        self._values = {m: np.empty(0) for m in self.measures}
+        if df is not None:
+            self.update(df)
+
+    def _encode(self, col, values):
+        labels = self.labels[col]
+        for value in pd.unique(values):
+            labels.setdefault(value, len(labels))
+        return pd.Categorical(values, categories=list(labels)).codes.astype(np.int32)
+
+    def update(self, df):
+        """Yeni satırları örnekleme ekler; katman başına en fazla ``per_stratum`` satır kalır."""
+        codes = {col: self._encode(col, df[col]) for col in self.strata}
+        stratum = np.zeros(len(df), dtype=np.int64)
+        for col in self.strata:
+            stratum = stratum * self._STRIDE + codes[col]
+        ids, counts = np.unique(stratum, return_counts=True)
+        for key, count in zip(ids.tolist(), counts.tolist()):
+            self.population[key] = self.population.get(key, 0) + count
+
+        keys = np.concatenate([self._keys, self._rng.random(len(df))])
+        stratum = np.concatenate([self._stratum, stratum])
+        # Katman içinde anahtara göre sıralayıp her katmanın ilk ``per_stratum`` satırı tutulur
+        order = np.lexsort((keys, stratum))
+        sorted_stratum = stratum[order]
+        rank = np.arange(len(order)) - np.searchsorted(sorted_stratum, sorted_stratum)
+        keep = order[rank < self.per_stratum]
+
+        self._keys, self._stratum = keys[keep], stratum[keep]
+        for col in self.strata:
+            self._codes[col] = np.concatenate([self._codes[col], codes[col]])[keep]
+        for m in self.measures:
+            new = df[m].to_numpy(dtype=np.float64)
+            self._values[m] = np.concatenate([self._values[m], new])[keep]
+        return self
+
+    @property
+    def n_rows(self):
+        """Örneklenen verinin toplam satır sayısı."""
+        return sum(self.population.values())
+
+    @property
+    def size(self):
+        """Örneklemdeki satır sayısı."""
+        return len(self._keys)
+
+    @property
+    def complete(self):
+        """Tüm satırlar örneklemde mi? (Bu durumda tahminler kesindir.)"""
+        return self.size == self.n_rows
+
+    def _sample_mask(self, ranges, categories):
+        mask = np.ones(self.size, dtype=bool)
+        for col, (lo, hi) in (ranges or {}).items():
+            if lo is not None:
+                mask &= self._values[col] >= lo
+            if hi is not None:
+                mask &= self._values[col] <= hi
+        for col, selected in (categories or {}).items():
+            if selected is None:
+                continue
+            allowed = [self.labels[col][v] for v in selected if v in self.labels[col]]
+            mask &= np.isin(self._codes[col], allowed)
+        return mask
+
+    def estimate(self, ranges=None, categories=None, z=1.96):
+        """
+        Filtre koşulunu sağlayan satırlar için yaklaşık sayı, toplam ve ortalamalar.
+
+        Koşullar ``IncrementalFilter`` ile aynı biçimdedir: ölçü sütunları için
+        ``(alt, üst)`` aralıkları, katman sütunları için izin verilen değerler
+        (``None`` tümü). ``{'count': Estimate, 'sum': {ölçü: Estimate},
+        'mean': {ölçü: Estimate}, 'exact': bool}`` döndürür; ``margin`` varsayılan
+        ``z=1.96`` ile %95 güven aralığının yarı genişliğidir.
+        """
+        strata, inverse, n_h = np.unique(self._stratum, return_inverse=True, return_counts=True)
+        big_n = np.array([self.population[key] for key in strata.tolist()], dtype=np.float64)
+        # Sonlu kitle düzeltmesi: tamamen örneklenen katmanlar varyansa katkı vermez
+        factor = big_n ** 2 * (1 - n_h / big_n) / n_h
+
+        def total(y):
+            sums = np.bincount(inverse, weights=y, minlength=len(strata))
+            squares = np.bincount(inverse, weights=y * y, minlength=len(strata))
+            means = sums / n_h
+            with np.errstate(invalid='ignore', divide='ignore'):
+                variances = np.where(n_h > 1, (squares - n_h * means ** 2) / (n_h - 1), 0.0)
+            return (big_n * means).sum(), float(np.sqrt(max((factor * variances).sum(), 0.0)))
+
+        mask = self._sample_mask(ranges, categories).astype(np.float64)
+        count, count_se = total(mask)
+        result = {
+            'count': Estimate(count, z * count_se),
+            'sum': {},
+            'mean': {},
+            'exact': bool((n_h == big_n).all()),
+        }
+        for m in self.measures:
+            y = self._values[m] * mask
+            value, se = total(y)
+            result['sum'][m] = Estimate(value, z * se)
+            if count > 0:
+                ratio = value / count
+                # Oran tahmincisinin doğrusallaştırılmış varyansı
+                _, ratio_se = total((self._values[m] - ratio) * mask)
+                result['mean'][m] = Estimate(ratio, z * ratio_se / count)
+            else:
+                result['mean'][m] = Estimate(np.nan, np.nan)
+        return result
+
+    def exact(self, df, ranges=None, categories=None):
+        """``estimate`` ile aynı biçimde, tüm veriyi tarayarak hesaplanan kesin sonuç."""
+        mask = np.ones(len(df), dtype=bool)
+        for col, (lo, hi) in (ranges or {}).items():
+            values = df[col].to_numpy()
+            if lo is not None:
+                mask &= values >= lo
+            if hi is not None:
+                mask &= values <= hi
+        for col, selected in (categories or {}).items():
+            if selected is not None:
+                mask &= df[col].isin(list(selected)).to_numpy()
+        count = int(mask.sum())
+        result = {'count': Estimate(count, 0.0), 'sum': {}, 'mean': {}, 'exact': True}
+        for m in self.measures:
+            value = df[m].to_numpy(dtype=np.float64)[mask].sum()
+            result['sum'][m] = Estimate(value, 0.0)
+            result['mean'][m] = Estimate(value / count if count else np.nan, 0.0)
+        return result
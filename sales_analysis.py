@@ -87,22 +87,68 @@ def features():
 
 
 @app.cell
-def load_data(mo):
-    import pandas as pd
-    data = pd.read_csv("sales_data.csv")
-    mo.md("### 📊 Örnek Satış Verisi")
-    mo.ui.dataframe(data.head())
+def source(mo):
+    import os
+    from sales_io import BackgroundLoader, read_sales
+    # CSV, Parquet/Arrow dosyası veya bölümlenmiş klasör olabilir
+    data_path = os.environ.get("SALES_DATA_PATH", "sales_data.csv")
+    get_load_version, set_load_version = mo.state(0)
+    if os.environ.get("SALES_ASYNC_LOAD") == "1":
+        # İlk parça hemen okunur, kalanı arka planda; her yayında veri hücresi yeniden çalışır
+        loader = BackgroundLoader(data_path, on_publish=set_load_version,
+                                  thread_factory=mo.Thread)
+        first_chunk = loader.start()
+        # Seçenekler yükleme boyunca sabit kalsın diye kategorilerden alınır
+        region_options = list(first_chunk["region"].cat.categories)
+    else:
+        loader = None
+        # Kategorik bölge/ürün, tarih ve dar tamsayı tipleriyle okunur;
+        # CSV ilk açılışta Arrow önbelleğine çevrilir, sonraki açılışlarda bellek eşlemeli okunur
+        first_chunk = read_sales(data_path, cache=True)
+        region_options = list(first_chunk["region"].unique())
+    return data_path, first_chunk, get_load_version, loader, region_options
+
+
+@app.cell
+def load_data(first_chunk, get_load_version, loader, mo):
+    from sales_io import memory_footprint
+    get_load_version()
+    if loader is None:
+        data, load_status = first_chunk, None
+    else:
+        data = loader.data
+        if loader.error is not None:
+            load_status = mo.callout(mo.md(f"❌ Yükleme yarıda kaldı: {loader.error}"), kind="danger")
+        elif not loader.done:
+            load_status = mo.callout(
+                mo.md(f"⏳ **Kısmi veri:** {len(data):,} satır yüklendi, yükleme arka planda sürüyor"),
+                kind="warn",
+            )
+        else:
+            load_status = mo.md(f"✅ {len(data):,} satırın tamamı yüklendi")
+    memory = memory_footprint(data)
+    mo.vstack([
+        mo.md("### 📊 Örnek Satış Verisi"),
+        load_status,
+        mo.md(f"💾 Bellek: **{memory.loc['TOPLAM', 'typed_mb']:.2f} MB** "
+              f"(şemasız okumada ~{memory.loc['TOPLAM', 'untyped_mb']:.2f} MB)"),
+        mo.ui.dataframe(data.head()),
+    ])
     return (data,)
 
 
 @app.cell
-def ui_elements(data, mo):
+def ui_elements(mo, region_options):
+    from ui_utils import debounced_slider
+    # Kontroller veriye değil sabit seçeneklere bağlıdır; arka planda yükleme sürerken
+    # yeniden oluşturulmaz ve seçimler korunur
     region_selector = mo.ui.dropdown(
         label="Bölge seçin:",
-        options=["Tümü"] + list(data["region"].unique()),
+        options=["Tümü"] + region_options,
         value="Tümü"
     )
-    min_revenue_slider = mo.ui.slider(0, 4500, 100, label="Minimum gelir filtresi:")
+    # Değer sürükleme bırakıldığında gönderilir; ara değerler için filtre/SQL/grafik çalışmaz
+    min_revenue_slider = debounced_slider(0, 4500, 100, label="Minimum gelir filtresi:")
     mo.md("### 🔧 Filtre Seçimleri")
     region_selector
     min_revenue_slider
@@ -110,37 +156,188 @@ def ui_elements(data, mo):
 
 
 @app.cell
-def filter_data(data, min_revenue_slider, mo, region_selector):
-    filtered_df = data.copy()
-    if region_selector.value != "Tümü":
-        filtered_df = filtered_df[filtered_df["region"] == region_selector.value]
-    filtered_df = filtered_df[filtered_df["revenue"] >= min_revenue_slider.value]
-    mo.md("### 🔍 Filtrelenmiş Veri")
-    mo.ui.dataframe(filtered_df)
+def indexes(data):
+    from sales_index import SortedIndex
+    # Gelir eşiği için sıralı indeks veri yüklendiğinde bir kez kurulur
+    revenue_index = SortedIndex(data["revenue"])
+    return (revenue_index,)
+
+
+@app.cell
+def filter_data(data, min_revenue_slider, region_selector, revenue_index):
+    from sales_report import filter_rows
+    from table_utils import PagedTable
+    # Filtre sonucu kopyalanmaz; tablo yalnızca seçilen satırların konumlarını tutar.
+    # Aynı filtre `python sales_report.py` toplu raporunda da kullanılır
+    filtered_rows = filter_rows(
+        data,
+        min_revenue_slider.value,
+        region=None if region_selector.value == "Tümü" else region_selector.value,
+        revenue_index=revenue_index,
+    )
+    sales_table = PagedTable(data, filtered_rows, sorted_indexes={"revenue": revenue_index})
+    return (sales_table,)
+
+
+@app.cell
+def table_controls(first_chunk, mo):
+    sort_column = mo.ui.dropdown(
+        label="Sırala:",
+        options=["Sıralama yok"] + list(first_chunk.columns),
+        value="Sıralama yok",
+    )
+    sort_descending = mo.ui.checkbox(label="Azalan")
+    return sort_column, sort_descending
+
+
+@app.cell
+def table_page(mo, sales_table):
+    # Filtre değiştiğinde sayfa sayısı yeniden hesaplanır ve ilk sayfaya dönülür
+    page_number = mo.ui.number(start=1, stop=sales_table.n_pages, step=1, value=1, label="Sayfa:")
+    return (page_number,)
+
+
+@app.cell
+def filtered_view(mo, page_number, sales_table, sort_column, sort_descending):
+    # Yalnızca görünen sayfa oluşturulup gönderilir; sıralama sunucu tarafında yapılır
+    page_df = sales_table.page(
+        page_number.value - 1,
+        sort_by=None if sort_column.value == "Sıralama yok" else sort_column.value,
+        descending=sort_descending.value,
+    )
+    mo.vstack([
+        mo.md("### 🔍 Filtrelenmiş Veri"),
+        mo.hstack([sort_column, sort_descending, page_number], justify="start", gap=2),
+        mo.ui.table(page_df, pagination=False, selection=None),
+        mo.md(sales_table.caption(page_number.value - 1)),
+    ])
     return
 
 
 @app.cell
-def sql_query(min_revenue_slider, mo):
-    import duckdb
-    query = f"""
-    SELECT region, product, revenue
-    FROM filtered_df
-    WHERE revenue >= {min_revenue_slider.value}
-    """
-    sql_result = duckdb.sql(query).to_df()
+def database(data_path, loader, mo):
+    from sales_db import ingest
+    # Veri kaynağı değiştiyse kalıcı DuckDB tablosuna (tarih/bölge sıralı) yeniden aktarılır.
+    # Arka plan yüklemesinde aktarım da çekirdeği bekletmesin diye ayrı iş parçacığında yapılır;
+    # durum: None = sürüyor, True = hazır, istisna = başarısız
+    if loader is None:
+        ingest(data_path)
+    get_db_status, set_db_status = mo.state(True if loader is None else None)
+    if loader is not None:
+        def _ingest():
+            try:
+                ingest(data_path)
+            except Exception as exc:
+                set_db_status(exc)
+            else:
+                set_db_status(True)
+
+        mo.Thread(target=_ingest, daemon=True).start()
+    return (get_db_status,)
+
+
+@app.cell
+def query_layer(get_db_status, mo):
+    from sales_db import prepared_queries
+    db_status = get_db_status()
+    if db_status is True:
+        # Sorgular bağlantı başına bir kez hazırlanır; slider değerleri parametre olarak bağlanır
+        queries, db_placeholder = prepared_queries(), None
+    elif db_status is None:
+        queries = None
+        db_placeholder = mo.callout(mo.md("⏳ Veri DuckDB'ye aktarılıyor; sorgular hazır olunca gösterilecek"),
+                                    kind="warn")
+    else:
+        queries = None
+        db_placeholder = mo.callout(mo.md(f"❌ DuckDB aktarımı başarısız: {db_status}"), kind="danger")
+    return db_placeholder, queries
+
+
+@app.cell
+def snapshots(data_path):
+    from sales_snapshots import SnapshotStore
+    # `python sales_snapshots.py` ile tüm bölge × eşik kombinasyonları önceden hesaplanmışsa
+    # (ve dosya bu veri kaynağından üretilmişse) sonuçlar sorgu yerine sözlükten okunur
+    snapshot_store = SnapshotStore.load(source_path=data_path)
+    return (snapshot_store,)
+
+
+@app.cell
+def sql_query(
+    db_placeholder,
+    min_revenue_slider,
+    mo,
+    queries,
+    region_selector,
+    snapshot_store,
+):
+    snapshot = None
+    if snapshot_store is not None:
+        snapshot = snapshot_store.get(region_selector.value, min_revenue_slider.value)
+    if snapshot is not None:
+        sql_result = snapshot["totals"]
+    elif queries is None:
+        sql_result = None
+    else:
+        # Toplama veritabanında yapılır; sonuç ürün × bölge sayısı kadar satırdır
+        sql_result = queries.run(
+            "product_region_totals",
+            min_revenue=min_revenue_slider.value,
+            region=None if region_selector.value == "Tümü" else region_selector.value,
+        )
     mo.md("### 🧠 SQL Sorgu Sonucu")
-    mo.ui.dataframe(sql_result)
-    return (sql_result,)
+    mo.vstack([
+        db_placeholder if sql_result is None else mo.ui.dataframe(sql_result),
+        mo.md("⚡ _Önceden hesaplanmış sonuç_" if snapshot is not None else ""),
+        mo.accordion({"⏱️ Sorgu süreleri": mo.ui.table(queries.stats())}) if queries is not None else None,
+    ])
+    return snapshot, sql_result
 
 
 @app.cell
-def visualize(mo, region_selector, sql_result):
-    import plotly.express as px
-    fig = px.bar(sql_result, x="product", y="revenue", color="region",
-                 title=f"Satış Gelirleri ({region_selector.value})")
+def visualize(mo, region_selector, snapshot, sql_result):
+    from sales_report import totals_figure
+    # Her ürün × bölge için tek çubuk parçası; grafik boyutu işlem sayısından bağımsız
+    if snapshot is not None:
+        fig = snapshot["figure"]
+    elif sql_result is not None:
+        fig = totals_figure(sql_result, region_selector.value)
+    else:
+        fig = None
     mo.md("### 📈 Dinamik Grafik (Plotly)")
-    mo.ui.plotly(fig)
+    chart = mo.ui.plotly(fig) if fig is not None else None
+    chart if chart is not None else mo.md("_Grafik, veritabanı hazır olunca çizilecek._")
+    return (chart,)
+
+
+@app.cell
+def drilldown(chart, min_revenue_slider, mo, queries, region_selector):
+    # Grafikte bir çubuk seçilince yalnızca o ürün × bölgenin ham satırları sorgulanır
+    selected_points = (chart.value or []) if chart is not None else []
+    if selected_points and queries is None:
+        drill_view = mo.md("_Ham işlemler, veritabanı hazır olunca sorgulanabilir._")
+    elif selected_points:
+        point = selected_points[0]
+        # Bölge grafiğe `custom_data` olarak eklenir; seçim noktasında renk sütunu yoktur
+        customdata = point.get("customdata")
+        drill_region = customdata[0] if customdata is not None and len(customdata) else None
+        if drill_region is None and region_selector.value != "Tümü":
+            drill_region = region_selector.value
+        drill_product = point.get("product", point.get("x"))
+        drill_rows = queries.run(
+            "drilldown_rows",
+            min_revenue=min_revenue_slider.value,
+            region=drill_region,
+            product=drill_product,
+            limit=500,
+        )
+        drill_view = mo.vstack([
+            mo.md(f"#### 🔎 {drill_product} / {drill_region or 'Tüm bölgeler'} (ilk 500 işlem)"),
+            mo.ui.table(drill_rows),
+        ])
+    else:
+        drill_view = mo.md("_Ham işlemleri görmek için grafikte bir çubuk seçin._")
+    drill_view
     return
 
 
@@ -0,0 +1,310 @@
+"""
+Satış verisi için kalıcı DuckDB veritabanı
+Veri bir kez ``sales.duckdb`` dosyasına aktarılır; dashboard sorguları her etkileşimde
+pandas tablosunu yeniden taramak yerine doğrudan bu tabloya gider.
+"""
+
+import datetime
+import glob
+import os
+import threading
+import time
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from sales_io import detect_format
+
+DB_PATH = 'sales.duckdb'
+TABLE = 'sales'
+
+# Sütun tipleri; CSV okunurken tahmin yerine bu şema kullanılır
+COLUMN_TYPES = {
+    'date': 'DATE',
+    'region': 'VARCHAR',
+    'product': 'VARCHAR',
+    'quantity': 'SMALLINT',
+    'revenue': 'DOUBLE',
+    'unit_price': 'DOUBLE',
+}
+
+_connections = {}
+_query_layers = {}
+# Veritabanı dosyası başına son aktarılan kaynak ve parmak izi
+_sources = {}
+_lock = threading.Lock()
+
+
+def connect(db_path=DB_PATH):
+    """
+    Veritabanına süreç başına tek bir salt okunur bağlantı açar ve onu yeniden kullanır.
+
+    Salt okunur bağlantılar birden çok süreçte aynı anda açılabilir (ör. iki
+    ``marimo run`` veya ``cell_profiler.py``). Dosya başka bir süreçte yazma kilidi
+    altındaysa, bu süreçte ``ingest`` edilen kaynak bellek içi bir veritabanına
+    yüklenir. Aynı dosyaya farklı iş parçacıklarından erişmek için
+    ``connect().cursor()`` kullanın.
+    """
+    with _lock:
+        return _connect_unlocked(db_path)
+
+
+def _connect_unlocked(db_path):
+    key = os.path.abspath(db_path)
+    if key not in _connections:
+        try:
+            _connections[key] = duckdb.connect(key, read_only=True)
+        except duckdb.IOException:
+            if key not in _sources:
+                raise
+            _connections[key] = _in_memory_copy(_sources[key][0])
+    return _connections[key]
+
+
+def _close_unlocked(key):
+    _query_layers.pop(key, None)
+    con = _connections.pop(key, None)
+    if con is not None:
+        con.close()
+
+
+def _quote(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def source_fingerprint(source):
+    """Kaynak dosya(lar)ın toplam boyutu ve en yeni değişiklik zamanı."""
+    paths = sorted(glob.glob(source)) if glob.has_magic(source) else [source]
+    if os.path.isdir(source):
+        paths = [os.path.join(root, name)
+                 for root, _, files in os.walk(source) for name in files]
+    stats = [os.stat(p) for p in paths]
+    return sum(s.st_size for s in stats), max(s.st_mtime_ns for s in stats)
+
+
+def _source_relation(con, source):
+    """Kaynağı tipleri açıkça belirtilmiş bir DuckDB tablo ifadesine çevirir."""
+    paths = sorted(glob.glob(source)) if glob.has_magic(source) else [source]
+    fmt = detect_format(paths[0])
+    if fmt == 'arrow':
+        import pyarrow.dataset as ds
+
+        partitioning = 'hive' if os.path.isdir(source) else None
+        dataset = ds.dataset(paths if len(paths) > 1 else source, format='ipc',
+                             partitioning=partitioning)
+        con.register('_ingest_source', dataset)
+        return '_ingest_source'
+    if fmt == 'csv':
+        columns = '{' + ', '.join(f"{_quote(c)}: {_quote(t)}" for c, t in COLUMN_TYPES.items()) + '}'
+        return f"read_csv({_quote(source)}, header = true, columns = {columns})"
+    if fmt == 'parquet':
+        pattern = os.path.join(source, '**', '*.parquet') if os.path.isdir(source) else source
+        return f"read_parquet({_quote(pattern)}, hive_partitioning = true, union_by_name = true)"
+    raise ValueError(f"DuckDB aktarımı için desteklenmeyen biçim: {fmt}")
+
+
+def _create_table(con, source):
+    columns = ', '.join(f"CAST({c} AS {t}) AS {c}" for c, t in COLUMN_TYPES.items())
+    con.execute(f"""
+        CREATE OR REPLACE TABLE {TABLE} AS
+        SELECT {columns} FROM {_source_relation(con, source)}
+        ORDER BY date, region
+    """)
+
+
+def _in_memory_copy(source):
+    """Kaynağı bellek içi bir DuckDB veritabanına yükler (dosya kilitliyken kullanılır)."""
+    con = duckdb.connect()
+    _create_table(con, source)
+    return con
+
+
+def _is_current(key, source, size, mtime_ns):
+    """Veritabanı dosyası bu kaynağın bu sürümünden mi aktarılmış?"""
+    if _sources.get(key) == (source, size, mtime_ns):
+        return True
+    if not os.path.exists(key):
+        return False
+    try:
+        with duckdb.connect(key, read_only=True) as con:
+            tables = {r[0] for r in con.execute("SELECT table_name FROM duckdb_tables()").fetchall()}
+            if TABLE not in tables or '_ingest_meta' not in tables:
+                return False
+            row = con.execute("SELECT size, mtime_ns FROM _ingest_meta WHERE source = ?",
+                              [source]).fetchone()
+    except duckdb.Error:
+        return False
+    return row == (size, mtime_ns)
+
+
+def ingest(source, db_path=DB_PATH, force=False):
+    """
+    Kaynağı ``sales`` tablosuna aktarır; kaynak değişmediyse hiçbir şey yapmaz.
+
+    Satırlar tarih ve bölgeye göre sıralı yazılır. DuckDB her satır grubu için
+    min/max (zone map) tuttuğundan tarih ve bölge koşulları ilgisiz grupları okumadan
+    atlar. Yazma için kısa ömürlü tek bir bağlantı açılır ve iş bitince kapatılır;
+    oturumlar ``connect`` ile salt okunur açılır. Dosya başka bir süreç tarafından
+    açık tutulduğu için yazılamıyorsa bu süreç kaynağı bellek içi bir veritabanından
+    sorgular. Aktarım yapıldıysa ``True`` döndürür.
+    """
+    key = os.path.abspath(db_path)
+    source = os.path.abspath(source)
+    size, mtime_ns = source_fingerprint(source)
+
+    with _lock:
+        if not force and _is_current(key, source, size, mtime_ns):
+            _sources[key] = (source, size, mtime_ns)
+            return False
+        # Aynı süreçte salt okunur ve yazma bağlantısı bir arada açılamaz
+        _close_unlocked(key)
+        _sources[key] = (source, size, mtime_ns)
+        try:
+            con = duckdb.connect(key)
+        except duckdb.IOException:
+            _connections[key] = _in_memory_copy(source)
+            return True
+        try:
+            con.execute("BEGIN TRANSACTION")
+            _create_table(con, source)
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS _ingest_meta (
+                    source VARCHAR PRIMARY KEY, size BIGINT, mtime_ns BIGINT
+                )
+            """)
+            con.execute("DELETE FROM _ingest_meta")
+            con.execute("INSERT INTO _ingest_meta VALUES (?, ?, ?)", [source, size, mtime_ns])
+            con.execute("COMMIT")
+        finally:
+            con.close()
+    return True
+
+
+# Dashboard'un kullandığı adlandırılmış, parametreli sorgular.
+# ``$1, $2 ...`` yer tutucuları ``params`` sırasıyla eşleşir.
+STATEMENTS = {
+    # Grafik için ürün × bölge toplamları; sonuç boyutu satır sayısından bağımsızdır
+    'product_region_totals': {
+        'sql': f"""
+            SELECT product, region,
+                   SUM(revenue) AS revenue,
+                   SUM(quantity) AS quantity,
+                   COUNT(*) AS transactions
+            FROM {TABLE}
+            WHERE revenue >= $1 AND ($2 IS NULL OR region = $2)
+            GROUP BY product, region
+            ORDER BY product, region
+        """,
+        'params': ('min_revenue', 'region'),
+    },
+    # Grafikte tıklanan çubuğun ham satırları (en yüksek gelirden başlayarak, sınırlı)
+    'drilldown_rows': {
+        'sql': f"""
+            SELECT date, region, product, quantity, revenue, unit_price
+            FROM {TABLE}
+            WHERE revenue >= $1
+              AND ($2 IS NULL OR region = $2)
+              AND ($3 IS NULL OR product = $3)
+            ORDER BY revenue DESC
+            LIMIT $4
+        """,
+        'params': ('min_revenue', 'region', 'product', 'limit'),
+    },
+}
+
+
+def _literal(value):
+    """Python/numpy değerini kaçışlı bir SQL sabitine çevirir (EXECUTE argümanları için)."""
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+    elif isinstance(value, np.generic):
+        # np.str_, np.int64, np.float64, np.bool_ ... yerleşik Python tiplerine
+        value = value.item()
+    if value is None:
+        return 'NULL'
+    if isinstance(value, str):
+        return _quote(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return f"DATE {_quote(value.isoformat()[:10])}"
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, (int, float)):
+        number = float(value)
+        if number != number or number in (float('inf'), float('-inf')):
+            raise ValueError(f"Geçersiz sayı: {value}")
+        return repr(int(value)) if number.is_integer() else repr(number)
+    raise TypeError(f"SQL sabitine çevrilemeyen değer: {value!r}")
+
+
+class PreparedQueries:
+    """
+    Adlandırılmış sorguları bağlantı başına bir kez hazırlayan (PREPARE) sorgu katmanı.
+
+    Her sorgu ilk kullanıldığında ayrıştırılıp planlanır; sonraki çağrılar yalnızca
+    parametreleri bağlayıp hazır planı çalıştırır (EXECUTE). Parametreler
+    ``EXECUTE ad(...)`` metnine ``_literal`` ile kaçışlı SQL sabitleri olarak yazılır
+    (metinlerde tek tırnak ikilenir, sayılar ``repr`` ile, geçersiz tipler reddedilir);
+    sorgu gövdesi ise kullanıcı değerlerinden bağımsızdır. Hazırlık ve çalıştırma
+    süreleri sorgu bazında ``stats()`` ile izlenebilir.
+    """
+
+    def __init__(self, con, statements=None):
+        # Hazır sorgular bağlantıya (cursor'a) aittir; bu yüzden katman kendi cursor'ını tutar
+        self.con = con
+        self.statements = dict(STATEMENTS if statements is None else statements)
+        self._prepared = set()
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def register(self, name, sql, params=()):
+        """Yeni bir adlandırılmış sorgu ekler."""
+        with self._lock:
+            self.statements[name] = {'sql': sql, 'params': tuple(params)}
+            if name in self._prepared:
+                self.con.execute(f"DEALLOCATE {name}")
+                self._prepared.discard(name)
+
+    def _prepare(self, name):
+        started = time.perf_counter()
+        self.con.execute(f"PREPARE {name} AS {self.statements[name]['sql']}")
+        self._prepared.add(name)
+        self._stat(name)['prepare_ms'] += (time.perf_counter() - started) * 1000
+
+    def _stat(self, name):
+        return self._stats.setdefault(name, {'prepare_ms': 0.0, 'executions': 0, 'execute_ms': 0.0})
+
+    def run(self, name, **params):
+        """Sorguyu verilen parametrelerle çalıştırır ve sonucu DataFrame olarak döndürür."""
+        with self._lock:
+            if name not in self._prepared:
+                self._prepare(name)
+            spec = self.statements[name]
+            args = ', '.join(_literal(params.get(p)) for p in spec['params'])
+            started = time.perf_counter()
+            result = self.con.execute(f"EXECUTE {name}({args})" if args else f"EXECUTE {name}").df()
+            stat = self._stat(name)
+            stat['executions'] += 1
+            stat['execute_ms'] += (time.perf_counter() - started) * 1000
+            return result
+
+    def stats(self):
+        """Sorgu bazında hazırlık süresi, çalıştırma sayısı ve ortalama çalıştırma süresi."""
+        rows = []
+        for name, stat in self._stats.items():
+            rows.append({
+                'query': name,
+                'prepare_ms': round(stat['prepare_ms'], 3),
+                'executions': stat['executions'],
+                'avg_execute_ms': round(stat['execute_ms'] / max(stat['executions'], 1), 3),
+            })
+        return rows
+
+
+def prepared_queries(db_path=DB_PATH):
+    """Veritabanı için süreç boyunca paylaşılan ``PreparedQueries`` örneği."""
+    key = os.path.abspath(db_path)
+    with _lock:
+        if key not in _query_layers:
+            _query_layers[key] = PreparedQueries(_connect_unlocked(key).cursor())
+        return _query_layers[key]
@@ -0,0 +1,385 @@
+"""
+Etkileşimli filtreler için bellek içi indeksler
+İndeksler DataFrame oluşturulurken bir kez kurulur; her UI değişikliğinde tüm tabloyu
+kopyalayıp taramak yerine küçük, önceden hesaplanmış yapılar üzerinde çalışılır.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class BitmapIndex:
+    """
+    Kategorik sütunlar için değer başına sıkıştırılmış (packed) bit vektörleri.
+
+    Her değer için satır başına bir bit tutulur (``np.packbits``); 1 milyon satırlık
+    bir bitmap 125 KB'tır. Çoklu seçim bitmap'lerin OR'u, sütunlar arası koşullar
+    AND'i ile, metin karşılaştırması yapmadan çözülür.
+    """
+
+    def __init__(self, df, columns):
+        self.n_rows = len(df)
+        self.bitmaps = {}
+        for col in columns:
+            codes, uniques = pd.factorize(df[col], sort=True)
+            self.bitmaps[col] = {
+                value: np.packbits(codes == i) for i, value in enumerate(uniques)
+            }
+
+    def values(self, column):
+        """Sütundaki farklı değerler (sıralı)."""
+        return list(self.bitmaps[column])
+
+    def all(self):
+        """Tüm satırları seçen bitmap."""
+        return np.packbits(np.ones(self.n_rows, dtype=bool))
+
+    def none(self):
+        """Hiç satır seçmeyen bitmap."""
+        return np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+
+    def isin(self, column, values):
+        """``column`` değeri ``values`` içinde olan satırların bitmap'i (OR)."""
+        result = self.none()
+        for value in values:
+            bitmap = self.bitmaps[column].get(value)
+            if bitmap is not None:
+                np.bitwise_or(result, bitmap, out=result)
+        return result
+
+    def select(self, **conditions):
+        """
+        Sütun başına değer listelerini AND'leyerek tek bir bitmap döndürür.
+        ``None`` verilen sütunlar filtrelenmez.
+        """
+        result = self.all()
+        for column, values in conditions.items():
+            if values is None:
+                continue
+            np.bitwise_and(result, self.isin(column, values), out=result)
+        return result
+
+    def to_mask(self, bitmap):
+        """Bitmap'i satır sayısı uzunluğunda bool maskeye açar."""
+        return np.unpackbits(bitmap, count=self.n_rows).view(bool)
+
+    def row_ids(self, bitmap):
+        """Bitmap'te seçili satırların sıralı konumları."""
+        return np.flatnonzero(self.to_mask(bitmap))
+
+
+class SortedIndex:
+    """
+    Sayısal bir sütun için sıralı indeks (argsort permütasyonu + sıralı değerler).
+
+    ``>=`` / ``<=`` / aralık eşikleri ``searchsorted`` ile O(log n) sürede permütasyon
+    içinde bitişik bir aralığa çevrilir; eşiği geçen satırların konumları bu aralığın
+    kendisidir. Sonuç diğer filtrelerin bool maskeleriyle birleştirilebilir.
+    Eksik değerler (NaN/NaT) sıralamada sona düşer ve hiçbir eşiği geçmez; yalnızca
+    sınırsız ``(None, None)`` koşulu onları da kapsar (``mask`` ile aynı).
+    """
+
+    # Seçilen satır oranı bunun üzerindeyse konum listesi yerine doğrudan maske kullanılır
+    DENSE_FRACTION = 0.25
+
+    def __init__(self, values):
+        values = np.asarray(values)
+        self.n_rows = len(values)
+        self.values = values
+        order = np.argsort(values, kind='stable')
+        self.order = order.astype(np.int32) if self.n_rows < 2 ** 31 else order
+        self.sorted_values = values[self.order]
+        # Sona dizilen eksik değerlerden önceki, eşiklerle karşılaştırılabilen satır sayısı
+        self.n_valid = self.n_rows - int(pd.isna(self.sorted_values).sum())
+
+    def positions(self, lo=None, hi=None, include_hi=True):
+        """``lo <= değer (<=|<) hi`` koşulunun sıralı dizideki ``(başlangıç, bitiş)`` aralığı."""
+        start = 0 if lo is None else np.searchsorted(self.sorted_values, lo, side='left')
+        if hi is None:
+            stop = self.n_rows if lo is None else self.n_valid
+        else:
+            stop = np.searchsorted(self.sorted_values, hi, side='right' if include_hi else 'left')
+        return int(start), int(max(start, stop))
+
+    def count(self, lo=None, hi=None, include_hi=True):
+        """Eşiği geçen satır sayısı; satırlara dokunmadan O(log n)."""
+        start, stop = self.positions(lo, hi, include_hi)
+        return stop - start
+
+    def row_ids(self, lo=None, hi=None, include_hi=True):
+        """Eşiği geçen satırların konumları (sıralı değer düzeninde, kopyasız görünüm)."""
+        start, stop = self.positions(lo, hi, include_hi)
+        return self.order[start:stop]
+
+    def select(self, lo=None, hi=None, include_hi=True, within=None):
+        """
+        Eşiği geçen ve (verilmişse) ``within`` bool maskesinde seçili satırların
+        artan sıralı konumları; sonuç doğrudan ``df.take`` ile kullanılabilir.
+
+        Seçim küçükse yalnızca aralıktaki konumlara dokunulur. Seçim tablonun büyük
+        bölümünü kapsıyorsa maske karşılaştırması daha ucuz olduğundan ona geçilir.
+        """
+        start, stop = self.positions(lo, hi, include_hi)
+        if stop - start > self.DENSE_FRACTION * self.n_rows:
+            mask = self.mask(lo, hi, include_hi)
+            if within is not None:
+                mask &= within
+            return np.flatnonzero(mask)
+        ids = self.order[start:stop]
+        if within is not None:
+            ids = ids[within[ids]]
+        return np.sort(ids)
+
+    def mask(self, lo=None, hi=None, include_hi=True):
+        """Aynı koşulun satır sayısı uzunluğunda bool maskesi."""
+        mask = np.ones(self.n_rows, dtype=bool)
+        if lo is not None:
+            mask &= self.values >= lo
+        if hi is not None:
+            mask &= (self.values <= hi) if include_hi else (self.values < hi)
+        return mask
+
+
+class TrigramIndex:
+    """
+    Metin sütununda alt dizi araması için büyük/küçük harf duyarsız trigram indeksi.
+
+    Her değer ``casefold`` ile küçültülür ve içindeki tüm 3 karakterlik parçalar (trigram)
+    için o parçayı içeren satırların sıralı listesi (posting list) tutulur. Listeler tek
+    bir düz dizide, trigram anahtarına göre sıralı (CSR düzeni) saklanır.
+
+    Arama, desenin trigramlarının listelerini en kısadan başlayarak keser; yalnızca
+    kalan aday satırlarda gerçek alt dizi kontrolü yapılır. Trigram sayısından kısa
+    desenler için tüm sütun taranır. Desen düz metindir (regex değildir).
+    """
+
+    GRAM = 3
+    # İndeks bu kadar satırlık parçalar halinde kurulur; ara diziler parça boyutuyla sınırlı
+    BUILD_CHUNK_ROWS = 200_000
+
+    def __init__(self, values):
+        folded = pd.Series(values).fillna('').astype(str).str.casefold()
+        self.n_rows = len(folded)
+        self.folded = folded.to_numpy(dtype=object)
+        lengths = folded.str.len().to_numpy()
+        pieces = [self._chunk(start, min(start + self.BUILD_CHUNK_ROWS, self.n_rows), lengths)
+                  for start in range(0, self.n_rows, self.BUILD_CHUNK_ROWS)]
+        # Parça parça CSR'lar birleştirilir: parçalar satır sırasında olduğundan her
+        # trigramın listesi, parçaların listeleri sırayla arka arkaya yazılarak artan kalır
+        self.keys = np.unique(np.concatenate([keys for keys, _, _ in pieces] or
+                                             [np.zeros(0, dtype=np.int64)]))
+        counts = np.zeros(len(self.keys), dtype=np.int64)
+        for keys, offsets, _ in pieces:
+            counts[np.searchsorted(self.keys, keys)] += np.diff(offsets)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.postings = np.empty(self.offsets[-1], dtype=np.int32)
+        cursor = self.offsets[:-1].copy()
+        for keys, offsets, rows in pieces:
+            slots = np.searchsorted(self.keys, keys)
+            sizes = np.diff(offsets)
+            self.postings[np.repeat(cursor[slots] - offsets[:-1], sizes)
+                          + np.arange(len(rows))] = rows
+            cursor[slots] += sizes
+
+    def _chunk(self, start, stop, lengths):
+        """``[start, stop)`` satırlarının trigram anahtarları, ofsetleri ve satır listesi (CSR)."""
+        # Sabit genişlikli unicode dizisi satır × karakter kod noktası matrisine çevrilir;
+        # kısa değerlerin sonu 0 ile doldurulur
+        width = max(int(lengths[start:stop].max()) if stop > start else 0, self.GRAM)
+        chars = np.array(self.folded[start:stop].tolist(), dtype=f'<U{width}').view(np.uint32)
+        chars = chars.reshape(-1, width).astype(np.int64)
+        # Kod noktaları 21 bite sığar; üç karakter tek bir int64 anahtara paketlenir
+        keys = ((chars[:, :-2] << 42) | (chars[:, 1:-1] << 21) | chars[:, 2:]).ravel()
+        rows = np.repeat(np.arange(start, stop, dtype=np.int32), width - 2)
+        valid = chars[:, 2:].ravel() != 0
+        keys, rows = keys[valid], rows[valid]
+        # Kararlı sıralama her anahtar içinde satırları artan sırada bırakır
+        order = np.argsort(keys, kind='stable')
+        keys, rows = keys[order], rows[order]
+        # Aynı değerde birden çok kez geçen trigramlar tek kayda indirilir
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = (keys[1:] != keys[:-1]) | (rows[1:] != rows[:-1])
+        keys, rows = keys[first], rows[first]
+        boundary = np.ones(len(keys), dtype=bool)
+        boundary[1:] = keys[1:] != keys[:-1]
+        starts = np.flatnonzero(boundary)
+        return keys[starts], np.append(starts, len(keys)), rows
+
+    def _key(self, gram):
+        a, b, c = (ord(ch) for ch in gram)
+        return (a << 42) | (b << 21) | c
+
+    def posting(self, gram):
+        """Trigramı (küçültülmüş) içeren satırların artan sıralı konumları."""
+        key = self._key(gram)
+        i = np.searchsorted(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            return self.postings[:0]
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def search(self, pattern, within=None):
+        """
+        ``pattern`` alt dizisini içeren satırların artan sıralı konumları.
+        ``within`` (artan sıralı konumlar) verilirse sonuç bu satırlarla sınırlanır.
+        """
+        pattern = pattern.casefold()
+        if len(pattern) < self.GRAM:
+            ids = np.arange(self.n_rows) if within is None else np.asarray(within)
+            return ids[[pattern in text for text in self.folded[ids]]]
+        grams = {pattern[i:i + self.GRAM] for i in range(len(pattern) - self.GRAM + 1)}
+        postings = sorted((self.posting(g) for g in grams), key=len)
+        ids = postings[0]
+        for other in postings[1:] + ([] if within is None else [np.asarray(within)]):
+            if not len(ids):
+                break
+            ids = _member(ids, other)
+        if len(pattern) == self.GRAM or not len(ids):
+            # Tek trigramlık desende liste kesin sonuçtur
+            return ids.astype(np.intp)
+        return ids[[pattern in text for text in self.folded[ids]]].astype(np.intp)
+
+
+def _member(ids, sorted_ids):
+    """``ids`` içinden ``sorted_ids``'de de bulunanlar; maliyet ``len(ids)`` ile orantılı."""
+    pos = np.searchsorted(sorted_ids, ids)
+    pos[pos == len(sorted_ids)] = 0
+    return ids[sorted_ids[pos] == ids] if len(sorted_ids) else ids[:0]
+
+
+def _contains(outer, inner):
+    """``inner`` aralığı ``outer`` aralığının içinde mi? (``None`` sınırsız demektir)"""
+    (olo, ohi), (ilo, ihi) = outer, inner
+    lo_ok = olo is None or (ilo is not None and ilo >= olo)
+    hi_ok = ohi is None or (ihi is not None and ihi <= ohi)
+    return lo_ok and hi_ok
+
+
+def _subset(outer, inner):
+    """``inner`` kategori seçimi ``outer``'ın alt kümesi mi? (``None`` tüm değerler demektir)"""
+    return outer is None or (inner is not None and inner <= outer)
+
+
+class IncrementalFilter:
+    """
+    Son koşulu ve sonucunu hatırlayan artımlı filtre motoru.
+
+    Koşullar sayısal sütunlar için ``(alt, üst)`` aralıkları (dahil, ``None`` sınırsız)
+    ve kategorik sütunlar için izin verilen değer kümeleridir (``None`` tümü).
+
+    - Yeni koşul öncekini yalnızca daraltıyorsa (eşik yukarı, seçim alt küme) sonuç,
+      önceki sonucun satırları yeniden süzülerek bulunur.
+    - Yalnızca bir eşik genişliyorsa ve o sütunun sıralı indeksi varsa, yeni eklenen
+      satırlar indeksteki iki aralık farkından bulunur ve önceki sonuçla birleştirilir.
+    - Diğer durumlarda (ve ilk çağrıda) indekslerle baştan hesaplanır.
+
+    ``last_mode`` ve ``last_touched`` son çağrıda hangi yolun kullanıldığını ve kaç
+    satırın değerlendirildiğini gösterir.
+    """
+
+    def __init__(self, df, ranges=(), categories=(), bitmap_index=None, sorted_indexes=None):
+        self.n_rows = len(df)
+        self.values = {c: df[c].to_numpy() for c in ranges}
+        self.codes = {}
+        self.code_of = {}
+        for col in categories:
+            codes, uniques = pd.factorize(df[col], sort=True)
+            self.codes[col] = codes
+            self.code_of[col] = {value: i for i, value in enumerate(uniques)}
+        self.bitmap_index = bitmap_index
+        self.sorted_indexes = dict(sorted_indexes or {})
+        self._last = None
+        self.last_mode = None
+        self.last_touched = 0
+
+    def _normalize(self, ranges, categories):
+        ranges = {c: tuple((ranges or {}).get(c, (None, None))) for c in self.values}
+        cats = {}
+        for col in self.codes:
+            selected = (categories or {}).get(col)
+            cats[col] = None if selected is None else frozenset(selected)
+        return ranges, cats
+
+    def _keep(self, ids, ranges, cats):
+        """``ids`` satırlarından koşulu sağlayanları döndürür; yalnızca bu satırlara dokunur."""
+        keep = np.ones(len(ids), dtype=bool)
+        for col, (lo, hi) in ranges.items():
+            if lo is None and hi is None:
+                continue
+            values = self.values[col][ids]
+            if lo is not None:
+                keep &= values >= lo
+            if hi is not None:
+                keep &= values <= hi
+        for col, selected in cats.items():
+            if selected is None:
+                continue
+            allowed = np.zeros(len(self.code_of[col]) + 1, dtype=bool)
+            for value in selected:
+                if value in self.code_of[col]:
+                    allowed[self.code_of[col][value]] = True
+            # -1 (eksik değer) son elemana düşer ve hiçbir zaman seçilmez
+            keep &= allowed[self.codes[col][ids]]
+        return ids[keep]
+
+    def _full(self, ranges, cats):
+        ranges, cats = dict(ranges), dict(cats)
+        within = None
+        if self.bitmap_index is not None:
+            indexed = {c: v for c, v in cats.items()
+                       if v is not None and c in self.bitmap_index.bitmaps}
+            if indexed:
+                within = self.bitmap_index.to_mask(self.bitmap_index.select(**indexed))
+                for col in indexed:
+                    cats[col] = None
+        for col, (lo, hi) in ranges.items():
+            if col in self.sorted_indexes and (lo is not None or hi is not None):
+                ids = self.sorted_indexes[col].select(lo, hi, within=within)
+                ranges[col] = (None, None)
+                break
+        else:
+            ids = np.flatnonzero(within) if within is not None else np.arange(self.n_rows)
+        self.last_touched = self.n_rows
+        return self._keep(ids, ranges, cats)
+
+    def _widened(self, col, old, new, ranges, cats):
+        """Tek bir eşik genişlediğinde yalnızca yeni aralığa giren satırları bulur."""
+        index = self.sorted_indexes[col]
+        new_start, new_stop = index.positions(*new)
+        old_start, old_stop = index.positions(*old)
+        delta = np.concatenate([index.order[new_start:old_start], index.order[old_stop:new_stop]])
+        others = {c: r for c, r in ranges.items() if c != col}
+        self.last_touched = len(delta)
+        return self._keep(delta, others, cats)
+
+    def apply(self, ranges=None, categories=None):
+        """Koşulu uygular ve seçilen satırların artan sıralı konumlarını döndürür."""
+        ranges, cats = self._normalize(ranges, categories)
+        if self._last is None:
+            self.last_mode = 'full'
+            ids = self._full(ranges, cats)
+            self._last = (ranges, cats, ids)
+            return ids
+
+        old_ranges, old_cats, old_ids = self._last
+        if ranges == old_ranges and cats == old_cats:
+            self.last_mode, self.last_touched = 'same', 0
+            return old_ids
+
+        narrowing = (all(_contains(old_ranges[c], ranges[c]) for c in ranges)
+                     and all(_subset(old_cats[c], cats[c]) for c in cats))
+        changed = [c for c in ranges if ranges[c] != old_ranges[c]]
+        if narrowing:
+            self.last_mode, self.last_touched = 'narrow', len(old_ids)
+            ids = self._keep(old_ids, ranges, cats)
+        elif (cats == old_cats and len(changed) == 1 and changed[0] in self.sorted_indexes
+                and _contains(ranges[changed[0]], old_ranges[changed[0]])):
+            col = changed[0]
+            self.last_mode = 'widen'
+            added = self._widened(col, old_ranges[col], ranges[col], ranges, cats)
+            ids = np.union1d(old_ids, added) if len(added) else old_ids
+        else:
+            self.last_mode = 'full'
+            ids = self._full(ranges, cats)
+
+        self._last = (ranges, cats, ids)
+        return ids
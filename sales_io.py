@@ -0,0 +1,585 @@
+"""
+Satış verisi okuma/yazma yardımcıları
+Üretici script ve Marimo uygulamaları aynı şemayı ve aynı okuyucuları kullanır.
+
+Desteklenen biçimler:
+- ``csv``: UTF-8 (BOM'lu) metin dosyası
+- ``parquet``: sütunsal, sıkıştırılmış dosya veya bölümlenmiş (hive) klasör
+- ``arrow``: Arrow IPC (Feather v2) dosyası veya bölümlenmiş klasör
+"""
+
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+
+import pandas as pd
+
+# Bölgeler ve ürünler
+REGIONS = ['İstanbul', 'Ankara', 'İzmir', 'Bursa', 'Antalya']
+PRODUCTS = ['Laptop', 'Telefon', 'Tablet', 'Kulaklık', 'Kamera', 'Monitör', 'Klavye', 'Mouse']
+
+SALES_COLUMNS = ['date', 'region', 'product', 'quantity', 'revenue', 'unit_price']
+
+# CSV okurken kullanılan şema; tarih ayrıca ``parse_dates`` ile çözülür
+CSV_DTYPES = {
+    'region': 'category',
+    'product': 'category',
+    'quantity': 'int16',
+    'revenue': 'float64',
+    'unit_price': 'float64',
+}
+_KNOWN_CATEGORIES = {'region': REGIONS, 'product': PRODUCTS}
+FORMATS = ['csv', 'parquet', 'arrow']
+PARTITION_COLUMNS = ['month', 'region']
+
+# Arrow önbelleğinin kaynak dosyanın yanında tutulduğu klasör
+CACHE_DIR_NAME = '.sales_cache'
+
+# ``read_csv(parse_dates=...)`` sonucundaki tarih tipi (pandas sürümüne göre ns/us)
+_DATE_DTYPE = pd.to_datetime(pd.Series(['2025-01-01'])).dtype
+
+_EXTENSIONS = {'.csv': 'csv', '.parquet': 'parquet', '.arrow': 'arrow', '.feather': 'arrow'}
+
+
+def _to_datetime(values):
+    """
+    Tarihleri CSV okumasının verdiği çözünürlükte ``datetime64``'e çevirir; Arrow
+    ``date32`` sütunları aksi halde saniye çözünürlüğünde gelir.
+    """
+    return pd.to_datetime(values).astype(_DATE_DTYPE)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError(
+            "Parquet/Arrow desteği için pyarrow gerekli: pip install pyarrow"
+        ) from exc
+    return pyarrow
+
+
+def arrow_schema():
+    """
+    Satış verisinin Arrow şeması.
+    Bölge/ürün sözlük kodlu, tarih ``date32``, miktar ``int16``, parasal alanlar ``float64``.
+    """
+    pa = _require_pyarrow()
+    return pa.schema([
+        ('date', pa.date32()),
+        ('region', pa.dictionary(pa.int8(), pa.string())),
+        ('product', pa.dictionary(pa.int8(), pa.string())),
+        ('quantity', pa.int16()),
+        ('revenue', pa.float64()),
+        ('unit_price', pa.float64()),
+    ])
+
+
+def to_arrow(df):
+    """DataFrame parçasını satış şemasına uygun bir ``pyarrow.Table``'a çevirir."""
+    pa = _require_pyarrow()
+    df = df[SALES_COLUMNS]
+    if not pd.api.types.is_datetime64_any_dtype(df['date']):
+        df = df.assign(date=pd.to_datetime(df['date']))
+    for col in ('region', 'product'):
+        if not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df = df.assign(**{col: df[col].astype('category')})
+    return pa.Table.from_pandas(df, schema=arrow_schema(), preserve_index=False)
+
+
+def detect_format(path):
+    """Dosya uzantısından biçimi bulur; klasörlerde içindeki ilk veri dosyasına bakılır."""
+    if os.path.isdir(path):
+        for _, _, files in sorted(os.walk(path)):
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in _EXTENSIONS:
+                    return detect_format(name)
+    ext = os.path.splitext(path)[1].lower()
+    if ext in _EXTENSIONS:
+        return _EXTENSIONS[ext]
+    raise ValueError(f"Biçim anlaşılamadı: {path}")
+
+
+def write_csv_batches(batches, path):
+    """
+    Parçaları aynı CSV dosyasına sırayla ekler.
+    BOM ve başlık satırı yalnızca ilk parçada yazılır; dosya ``to_csv`` çıktısıyla aynıdır.
+    Hiç parça gelmezse yalnızca başlıktan oluşan bir dosya yazılır.
+    """
+    first = True
+    for batch in batches:
+        batch.to_csv(path, index=False, header=first,
+                     mode='w' if first else 'a',
+                     encoding='utf-8-sig' if first else 'utf-8')
+        first = False
+        yield batch
+    if first:
+        pd.DataFrame(columns=SALES_COLUMNS).to_csv(path, index=False, encoding='utf-8-sig')
+
+
+def write_parquet_batches(batches, path):
+    """Parçaları tek bir Parquet dosyasına, her parça bir row group olacak şekilde yazar."""
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    with pq.ParquetWriter(path, arrow_schema()) as writer:
+        for batch in batches:
+            writer.write_table(to_arrow(batch))
+            yield batch
+
+
+def write_arrow_batches(batches, path):
+    """Parçaları tek bir Arrow IPC (Feather v2) dosyasına kayıt grupları olarak yazar."""
+    pa = _require_pyarrow()
+
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, arrow_schema()) as writer:
+        for batch in batches:
+            writer.write_table(to_arrow(batch))
+            yield batch
+
+
+def write_partitioned_batches(batches, root, fmt, partition_by, prefix='part'):
+    """
+    Parçaları ``root`` altında hive düzeninde bölümlenmiş (``month=2025-05/region=Ankara/``)
+    bir veri kümesi olarak yazar. ``month`` sütunu tarihten türetilir.
+    """
+    pa = _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    for i, batch in enumerate(batches):
+        table = to_arrow(batch)
+        if 'month' in partition_by:
+            months = pd.to_datetime(batch['date']).dt.strftime('%Y-%m').to_numpy()
+            table = table.append_column('month', pa.array(months))
+        ds.write_dataset(
+            table, root,
+            format='ipc' if fmt == 'arrow' else 'parquet',
+            partitioning=list(partition_by),
+            partitioning_flavor='hive',
+            basename_template=f"{prefix}-{i:05d}-{{i}}.{fmt}",
+            existing_data_behavior='overwrite_or_ignore',
+        )
+        yield batch
+
+
+def write_batches(batches, path, fmt='csv', partition_by=None, prefix='part'):
+    """İstenen biçim ve bölümlemeye göre uygun yazıcıyı seçer; parçaları geri verir."""
+    if partition_by:
+        if fmt == 'csv':
+            raise ValueError("Bölümleme yalnızca parquet ve arrow biçimlerinde desteklenir")
+        return write_partitioned_batches(batches, path, fmt, partition_by, prefix)
+    if fmt == 'parquet':
+        return write_parquet_batches(batches, path)
+    if fmt == 'arrow':
+        return write_arrow_batches(batches, path)
+    return write_csv_batches(batches, path)
+
+
+def load_sales_csv(path, usecols=None):
+    """
+    ``sales_data.csv`` biçimindeki dosyayı açık bir şemayla okur.
+
+    Bölge/ürün kategorik (bilinen değerler sabit sırada, bilinmeyenler sona eklenir),
+    tarih ``datetime64``, miktar ``int16`` olur; filtreler ve gruplamalar metin
+    yerine tamsayı kodları üzerinde çalışır.
+    """
+    dtypes = {c: t for c, t in CSV_DTYPES.items() if usecols is None or c in usecols}
+    parse_dates = ['date'] if usecols is None or 'date' in usecols else False
+    df = pd.read_csv(path, usecols=usecols, dtype=dtypes, parse_dates=parse_dates,
+                     encoding='utf-8-sig')
+    return _known_categories_first(df)
+
+
+def empty_sales_frame():
+    """``load_sales_csv`` şemasında (kategoriler ve tipler dahil) satırsız DataFrame."""
+    df = load_sales_csv(io.StringIO(','.join(SALES_COLUMNS) + '\n'))
+    df['date'] = _to_datetime(df['date'])
+    return df
+
+
+def _known_categories_first(df):
+    """Bölge/ürün kategorilerini bilinen değerler sabit sırada olacak şekilde düzenler."""
+    for col, known in _KNOWN_CATEGORIES.items():
+        if col in df.columns:
+            extra = [c for c in df[col].cat.categories if c not in known]
+            df[col] = df[col].cat.set_categories(known + extra)
+    return df
+
+
+def _object_equivalent_bytes(series):
+    """Sütunun şemasız okunduğunda (object metin / int64) kaplayacağı yaklaşık bellek."""
+    n = len(series)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        counts = series.cat.codes.value_counts()
+        sizes = {code: sys.getsizeof(str(series.cat.categories[code]))
+                 for code in counts.index if code >= 0}
+        return 8 * n + sum(counts[code] * size for code, size in sizes.items())
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return n * (8 + sys.getsizeof('2025-01-01'))
+    return n * 8
+
+
+def memory_footprint(df):
+    """
+    Sütun bazında bellek kullanımını (MB) şemalı ve şemasız (object/int64) okuma
+    için karşılaştırır. Şemasız değer, veriyi yeniden okumadan kategori sayımlarından
+    tahmin edilir.
+    """
+    typed = df.memory_usage(index=False, deep=True)
+    untyped = pd.Series({c: _object_equivalent_bytes(df[c]) for c in df.columns})
+    report = pd.DataFrame({'typed_mb': typed, 'untyped_mb': untyped}) / 1024 ** 2
+    report.loc['TOPLAM'] = report.sum()
+    report['ratio'] = report['typed_mb'] / report['untyped_mb']
+    return report.round(3)
+
+
+def content_hash(path, block_size=8 * 1024 * 1024):
+    """Dosya içeriğinin BLAKE2b özeti (parça parça okunur, bellek kullanımı sabittir)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_cache_meta(meta_path):
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path, write):
+    """``write(tmp_path)`` ile geçici dosyaya yazar, sonra tek adımda yerine taşır."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def cached_arrow_path(path, cache_dir=None):
+    """
+    CSV dosyası için güncel Arrow önbellek dosyasının yolunu döndürür; gerekirse oluşturur.
+
+    Önbellek, kaynağın boyutu, değişiklik zamanı ve içerik özetiyle anahtarlanır.
+    Boyut ve zaman önceki kayıtla aynıysa dosya yeniden okunmaz; farklıysa içerik
+    özeti hesaplanır ve yalnızca içerik gerçekten değiştiyse CSV yeniden ayrıştırılır.
+    Önbellek sıkıştırılmamış Arrow IPC (Feather v2) dosyasıdır, böylece bellek
+    eşlemeli (memory-mapped) okunabilir.
+    """
+    pa = _require_pyarrow()
+    path = os.path.abspath(path)
+    cache_dir = cache_dir or os.path.join(os.path.dirname(path), CACHE_DIR_NAME)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    stat = os.stat(path)
+    meta_path = os.path.join(cache_dir, os.path.basename(path) + '.json')
+    meta = _read_cache_meta(meta_path)
+    if meta and meta['size'] == stat.st_size and meta['mtime_ns'] == stat.st_mtime_ns:
+        arrow_path = os.path.join(cache_dir, meta['arrow'])
+        if os.path.exists(arrow_path):
+            return arrow_path
+
+    digest = content_hash(path)
+    arrow_path = os.path.join(cache_dir, f"{digest}.arrow")
+    if not os.path.exists(arrow_path):
+        table = to_arrow(load_sales_csv(path))
+
+        def write(tmp):
+            with pa.OSFile(tmp, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+        _write_atomic(arrow_path, write)
+
+    previous = meta
+    meta = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+            'hash': digest, 'arrow': os.path.basename(arrow_path)}
+
+    def write_meta(tmp):
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+    _write_atomic(meta_path, write_meta)
+    if previous and previous.get('arrow') and previous['arrow'] != meta['arrow']:
+        _remove_unreferenced(cache_dir, previous['arrow'])
+    return arrow_path
+
+
+def _remove_unreferenced(cache_dir, arrow_name):
+    """Eski önbellek dosyasını, aynı klasördeki başka bir kaynak kullanmıyorsa siler."""
+    for name in os.listdir(cache_dir):
+        if name.endswith('.json'):
+            other = _read_cache_meta(os.path.join(cache_dir, name))
+            if other and other.get('arrow') == arrow_name:
+                return
+    try:
+        os.remove(os.path.join(cache_dir, arrow_name))
+    except OSError:
+        pass
+
+
+def load_sales_cached(path, columns=None, cache_dir=None):
+    """
+    CSV'yi Arrow önbelleği üzerinden okur.
+
+    Önbellek dosyası bellek eşlemeli açılır; sayısal sütunlar kopyalanmadan
+    doğrudan eşlenmiş sayfaları kullanır ve aynı dosyayı açan süreçler bu
+    sayfaları işletim sisteminin sayfa önbelleği üzerinden paylaşır. Önbellek
+    klasörü oluşturulamıyorsa (ör. salt okunur veri klasörü) CSV doğrudan okunur.
+    """
+    pa = _require_pyarrow()
+    try:
+        arrow_path = cached_arrow_path(path, cache_dir)
+    except OSError:
+        return load_sales_csv(path, usecols=columns)
+    source = pa.memory_map(arrow_path, 'r')
+    table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select(list(columns))
+    df = table.to_pandas(split_blocks=True)
+    if 'date' in df.columns:
+        df['date'] = _to_datetime(df['date'])
+    return df
+
+
+def _dataset_filter(regions=None, months=None):
+    import pyarrow.dataset as ds
+
+    expr = None
+    for field, values in (('region', regions), ('month', months)):
+        if values:
+            cond = ds.field(field).isin(list(values))
+            expr = cond if expr is None else expr & cond
+    return expr
+
+
+def read_sales(path, columns=None, regions=None, months=None, cache=False):
+    """
+    Satış verisini biçimden bağımsız olarak okur.
+
+    ``path`` tek bir dosya, bölümlenmiş bir klasör veya ``*.part-*.parquet`` gibi bir
+    glob deseni olabilir. Parquet/Arrow kaynaklarında yalnızca ``columns`` sütunları
+    okunur; ``regions``/``months`` bölüm klasörlerinde dizin düzeyinde, tek dosyalarda
+    satır grubu istatistikleriyle budanır. ``cache=True`` ise CSV kaynakları
+    ``load_sales_cached`` ile Arrow önbelleği üzerinden okunur.
+    """
+    paths = sorted(glob.glob(path)) if glob.has_magic(path) else [path]
+    if not paths:
+        raise FileNotFoundError(path)
+    fmt = detect_format(paths[0])
+
+    if fmt == 'csv':
+        usecols = None
+        if columns is not None:
+            filter_cols = (['region'] if regions else []) + (['date'] if months else [])
+            usecols = list(dict.fromkeys(list(columns) + filter_cols))
+        if cache:
+            frames = [load_sales_cached(p, columns=usecols) for p in paths]
+        else:
+            frames = [load_sales_csv(p, usecols=usecols) for p in paths]
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        if regions:
+            df = df[df['region'].isin(list(regions))]
+        if months:
+            df = df[df['date'].dt.strftime('%Y-%m').isin(list(months))]
+        if columns is not None:
+            df = df[list(columns)]
+        return df.reset_index(drop=True)
+
+    _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    source = paths if len(paths) > 1 else paths[0]
+    partitioning = None
+    if os.path.isdir(paths[0]):
+        # Bölüm sütunları (region, month) da kategorik olarak gelsin
+        partitioning = ds.HivePartitioning.discover(infer_dictionary=True)
+    dataset = ds.dataset(source, format='ipc' if fmt == 'arrow' else 'parquet',
+                         partitioning=partitioning)
+    if months and 'month' not in dataset.schema.names:
+        # Bölümlenmemiş kaynakta ay filtresi tarih aralığına çevrilir
+        dates = pd.to_datetime([f"{m}-01" for m in months])
+        month_filter = None
+        for start in dates:
+            cond = ((ds.field('date') >= start.date())
+                    & (ds.field('date') < (start + pd.offsets.MonthBegin(1)).date()))
+            month_filter = cond if month_filter is None else month_filter | cond
+        region_filter = _dataset_filter(regions=regions)
+        expr = month_filter if region_filter is None else month_filter & region_filter
+    else:
+        expr = _dataset_filter(regions, months)
+
+    names = [c for c in (columns or SALES_COLUMNS) if c in dataset.schema.names]
+    table = dataset.to_table(columns=names, filter=expr)
+    df = table.to_pandas()
+    if 'date' in df.columns:
+        df['date'] = _to_datetime(df['date'])
+    return df
+
+
+# Arka planda yüklemede parça başına satır sayısı
+CHUNK_ROWS = 100_000
+
+
+def iter_sales_chunks(path, chunk_rows=CHUNK_ROWS):
+    """
+    Satış verisini ``read_sales`` ile aynı şemada, en fazla ``chunk_rows`` satırlık
+    DataFrame parçaları olarak okur. CSV'de ``read_csv(chunksize=...)``, Parquet/Arrow
+    kaynaklarında Arrow kayıt grupları (record batch) kullanılır.
+    """
+    paths = sorted(glob.glob(path)) if glob.has_magic(path) else [path]
+    if not paths:
+        raise FileNotFoundError(path)
+    fmt = detect_format(paths[0])
+
+    if fmt == 'csv':
+        for p in paths:
+            with pd.read_csv(p, dtype=CSV_DTYPES, parse_dates=['date'], encoding='utf-8-sig',
+                             chunksize=chunk_rows) as reader:
+                for chunk in reader:
+                    if len(chunk):
+                        yield _known_categories_first(chunk)
+        return
+
+    pa = _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    partitioning = None
+    if os.path.isdir(paths[0]):
+        partitioning = ds.HivePartitioning.discover(infer_dictionary=True)
+    dataset = ds.dataset(paths if len(paths) > 1 else paths[0],
+                         format='ipc' if fmt == 'arrow' else 'parquet',
+                         partitioning=partitioning)
+    names = [c for c in SALES_COLUMNS if c in dataset.schema.names]
+    for batch in dataset.to_batches(columns=names, batch_size=chunk_rows):
+        if not batch.num_rows:
+            continue
+        df = pa.Table.from_batches([batch]).to_pandas()
+        df['date'] = _to_datetime(df['date'])
+        yield df
+
+
+def concat_chunks(frames):
+    """
+    Parçaları birleştirir. Parçalar arasında kategori listeleri farklıysa kategorik
+    sütunlar ``union_categoricals`` ile birleştirilir (``concat`` onları metne çevirirdi).
+    """
+    if len(frames) == 1:
+        return frames[0]
+    df = pd.concat(frames, ignore_index=True)
+    for col in frames[0].columns:
+        if isinstance(frames[0][col].dtype, pd.CategoricalDtype) and df[col].dtype == object:
+            df[col] = pd.api.types.union_categoricals([f[col] for f in frames])
+    return df
+
+
+class BackgroundLoader:
+    """
+    Satış verisini arka plan iş parçacığında parça parça yükler.
+
+    ``start`` ilk parçayı hemen (çağıran iş parçacığında) okuyup döndürür; kalan
+    parçalar arka planda okunur. Yüklenen satır sayısı son yayından bu yana
+    ``growth`` katına çıktığında ve yükleme bittiğinde ``on_publish(sürüm)`` çağrılır;
+    böylece arayüz dosya boyutundan bağımsız olarak logaritmik sayıda güncellenir.
+
+    ``thread_factory`` ile iş parçacığı sınıfı verilebilir (ör. marimo'da ``mo.Thread``).
+    İş parçacığının ``should_exit`` özelliği ``True`` olursa veya ``stop`` çağrılırsa
+    okuma bırakılır.
+    """
+
+    def __init__(self, path, chunk_rows=CHUNK_ROWS, on_publish=None, growth=2.0,
+                 thread_factory=threading.Thread):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.on_publish = on_publish
+        self.growth = growth
+        self.thread_factory = thread_factory
+        self.rows_loaded = 0
+        self.version = 0
+        self.done = False
+        self.error = None
+        self._frames = []
+        self._published_rows = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._cache = (None, None)
+        self._thread = None
+
+    def start(self):
+        """
+        İlk parçayı okur, kalanlar için arka plan okumasını başlatır; ilk parçayı döndürür.
+        Kaynakta satır yoksa şemalı boş bir DataFrame yayınlanır ve yükleme bitmiş sayılır.
+        """
+        chunks = iter_sales_chunks(self.path, self.chunk_rows)
+        first = next(chunks, None)
+        if first is None:
+            first = empty_sales_frame()
+            self._add(first)
+            self.done = True
+            self._publish()
+            return first
+        self._add(first)
+        self._published_rows = self.rows_loaded
+        self._thread = self.thread_factory(target=self._run, args=(chunks,), daemon=True)
+        self._thread.start()
+        return first
+
+    def _add(self, chunk):
+        with self._lock:
+            self._frames.append(chunk)
+            self.rows_loaded += len(chunk)
+
+    def _publish(self):
+        with self._lock:
+            self.version += 1
+            self._published_rows = self.rows_loaded
+            version = self.version
+        if self.on_publish is not None:
+            self.on_publish(version)
+
+    def _run(self, chunks):
+        current = threading.current_thread()
+        try:
+            for chunk in chunks:
+                if self._stop.is_set() or getattr(current, 'should_exit', False):
+                    return
+                self._add(chunk)
+                if self.rows_loaded >= self.growth * self._published_rows:
+                    self._publish()
+        except Exception as exc:  # hata yüklenen kısmı bozmaz; ``error`` ile gösterilir
+            self.error = exc
+        finally:
+            self.done = True
+        self._publish()
+
+    @property
+    def data(self):
+        """Şimdiye kadar yüklenen satırlar (tek DataFrame; sürüm başına bir kez birleştirilir)."""
+        with self._lock:
+            frames, version = list(self._frames), self.version
+        cached_version, cached = self._cache
+        if cached_version != version or cached is None:
+            cached = concat_chunks(frames)
+            with self._lock:
+                # Sonraki birleştirmeler baştan değil bu sonuçtan devam eder
+                self._frames[:len(frames)] = [cached]
+            self._cache = (version, cached)
+        return cached
+
+    def wait(self, timeout=None):
+        """Yükleme bitene kadar bekler."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.done
+
+    def stop(self):
+        """Arka plan okumasını bir sonraki parçada durdurur."""
+        self._stop.set()
@@ -0,0 +1,131 @@
+"""
+Satış analizi için tarayıcısız toplu çalıştırma
+``sales_analysis.py`` dashboard'undaki filtre ve ürün × bölge toplamını arayüz
+oluşturmadan çalıştırır ve sonuçları Parquet/CSV olarak dışa aktarır. Zamanlanmış
+(ör. gece) raporlar için kullanılır; dashboard da aynı fonksiyonları kullanır.
+
+Kullanım:
+    python sales_report.py --input sales_data.csv --region Ankara --min-revenue 2000
+    python sales_report.py --input veri/ --min-revenue 1000 --format csv --output-dir rapor
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from sales_index import SortedIndex
+from sales_io import read_sales
+
+REPORT_FORMATS = ('parquet', 'csv')
+
+
+def filter_rows(data, min_revenue, region=None, revenue_index=None):
+    """
+    ``revenue >= min_revenue`` ve (verilmişse) ``region`` koşulunu sağlayan satırların
+    artan sıralı konumları. Aynı veri üzerinde tekrar tekrar çağrılacaksa
+    ``revenue_index`` (``SortedIndex``) bir kez kurulup verilmelidir.
+    """
+    if revenue_index is None:
+        revenue_index = SortedIndex(data['revenue'].to_numpy())
+    region_mask = None
+    if region is not None:
+        region_mask = (data['region'] == region).to_numpy()
+    return revenue_index.select(min_revenue, within=region_mask)
+
+
+def product_region_totals(filtered):
+    """
+    Ürün × bölge başına gelir, miktar ve işlem sayısı; ``sales_db``'deki
+    ``product_region_totals`` sorgusuyla aynı sütunlar ve sıralama.
+    """
+    totals = (filtered.groupby(['product', 'region'], observed=True)
+                      .agg(revenue=('revenue', 'sum'), quantity=('quantity', 'sum'),
+                           transactions=('revenue', 'size'))
+                      .reset_index())
+    totals['product'] = totals['product'].astype(str)
+    totals['region'] = totals['region'].astype(str)
+    return totals.sort_values(['product', 'region'], ignore_index=True)
+
+
+def totals_figure(totals, region_label):
+    """
+    Dashboard'daki ürün × bölge gelir grafiği (her ürün × bölge için tek çubuk parçası).
+    Seçilen çubuğun bölgesi ``customdata[0]`` olarak gelir; marimo'nun seçim
+    noktalarında renk sütunu yer almaz.
+    """
+    import plotly.express as px
+
+    return px.bar(totals, x="product", y="revenue", color="region",
+                  custom_data=["region"], hover_data=["quantity", "transactions"],
+                  title=f"Satış Gelirleri ({region_label})")
+
+
+def export(df, path, fmt):
+    """DataFrame'i ``parquet`` veya ``csv`` olarak yazar."""
+    if fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def run_report(input_path, min_revenue=0, region=None, output_dir='.', fmt='parquet'):
+    """
+    Veriyi okur, filtreler, toplar ve iki dosya yazar:
+    ``filtered_sales.<biçim>`` ve ``product_region_totals.<biçim>``.
+    Bölge verilirse Parquet/Arrow kaynaklarında yalnızca o bölgenin satırları okunur;
+    bölge veride yoksa dosya yazılmadan ``ValueError`` verilir.
+    """
+    data = read_sales(input_path, regions=[region] if region else None, cache=True)
+    if region and not (data['region'] == region).any():
+        available = read_sales(input_path, columns=['region'], cache=True)['region']
+        names = ', '.join(sorted(str(r) for r in available.unique()))
+        raise ValueError(f"'{region}' bölgesi veride yok (mevcut bölgeler: {names})")
+    filtered = data.take(filter_rows(data, min_revenue, region))
+    totals = product_region_totals(filtered)
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = [
+        export(filtered, os.path.join(output_dir, f'filtered_sales.{fmt}'), fmt),
+        export(totals, os.path.join(output_dir, f'product_region_totals.{fmt}'), fmt),
+    ]
+    return len(data), filtered, totals, paths
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Satış analizi toplu raporu")
+    parser.add_argument("--input", default=os.environ.get("SALES_DATA_PATH", "sales_data.csv"),
+                        help="CSV/Parquet/Arrow dosyası, bölümlenmiş klasör veya glob deseni")
+    parser.add_argument("--region", default=None,
+                        help="Yalnızca bu bölge (varsayılan: tüm bölgeler)")
+    parser.add_argument("--min-revenue", type=float, default=0,
+                        help="Minimum gelir filtresi")
+    parser.add_argument("--output-dir", default=".", help="Çıktı klasörü")
+    parser.add_argument("--format", choices=REPORT_FORMATS, default='parquet',
+                        help="Çıktı biçimi")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+    try:
+        n_rows, filtered, totals, paths = run_report(
+            args.input, args.min_revenue, args.region, args.output_dir, args.format,
+        )
+    except ValueError as exc:
+        sys.exit(f"❌ {exc}")
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ Okunan {n_rows:,} satırdan {len(filtered):,} satır filtrelendi "
+          f"(bölge: {args.region or 'Tümü'}, minimum gelir: {args.min_revenue:,.0f})")
+    for path in paths:
+        print(f"💾 {path}")
+    print(f"⏱️ Toplam süre: {elapsed:.3f} sn")
+    print("\n📈 Ürün × bölge toplamları:")
+    print(totals.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Dashboard filtre kombinasyonları için önceden hesaplanmış sonuçlar
+``sales_analysis.py``'deki bölge seçimi × gelir eşiği (0–4500, 100'er adım) uzayının
+tamamı için filtre → toplam → grafik hattını süreç havuzunda çalıştırır ve sonuçları
+(ürün × bölge tablosu ve grafik JSON'u) tek bir sıkıştırılmış Parquet dosyasında
+anahtarlı olarak saklar. Dashboard bu dosya güncelse etkileşimleri hesaplamadan,
+sözlük aramasıyla cevaplar.
+
+Kullanım:
+    python sales_snapshots.py --input sales_data.csv --output sales_snapshots.parquet --workers 8
+"""
+
+import argparse
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from sales_db import source_fingerprint
+from sales_index import SortedIndex
+from sales_io import read_sales
+from sales_report import filter_rows, product_region_totals, totals_figure
+
+SNAPSHOT_PATH = 'sales_snapshots.parquet'
+# sales_analysis.py'deki slider ile aynı adımlar
+MIN_REVENUE_STEPS = tuple(range(0, 4501, 100))
+ALL_REGIONS = "Tümü"
+# Saklanan tablo/grafik biçimi değiştiğinde artırılır; eski dosyalar yok sayılır
+SNAPSHOT_VERSION = 2
+
+_worker = {}
+
+
+def snapshot_key(region, min_revenue):
+    """Bölge seçimi (``"Tümü"`` dahil) ve eşik için saklama anahtarı."""
+    return f"{region}|{int(min_revenue)}"
+
+
+def _init_worker(input_path):
+    # Her işçi veriyi ve gelir indeksini bir kez yükler; görevler yalnızca anahtar taşır
+    data = read_sales(input_path, cache=True)
+    _worker['data'] = data
+    _worker['index'] = SortedIndex(data['revenue'].to_numpy())
+
+
+def _compute(task):
+    region, min_revenue = task
+    started = time.perf_counter()
+    data = _worker['data']
+    rows = filter_rows(data, min_revenue, None if region == ALL_REGIONS else region,
+                       revenue_index=_worker['index'])
+    totals = product_region_totals(data.take(rows))
+    record = {
+        'key': snapshot_key(region, min_revenue),
+        'region': region,
+        'min_revenue': int(min_revenue),
+        'rows': len(rows),
+        'totals': totals.to_json(orient='split', index=False),
+        'figure': totals_figure(totals, region).to_json(),
+    }
+    return record, os.getpid(), time.perf_counter() - started
+
+
+def precompute(input_path, output=SNAPSHOT_PATH, workers=None, regions=None):
+    """
+    Tüm kombinasyonları hesaplayıp ``output`` dosyasına yazar.
+    Kaynağın boyutu ve değişiklik zamanı dosya metadata'sına kaydedilir; dashboard
+    eski bir dosyayı bu sayede kullanmaz. Çalıştırma istatistiklerini döndürür.
+    """
+    input_path = os.path.abspath(input_path)
+    if regions is None:
+        regions = [str(r) for r in read_sales(input_path, columns=['region'])['region'].unique()]
+    tasks = [(region, step) for region in [ALL_REGIONS, *regions] for step in MIN_REVENUE_STEPS]
+    workers = workers or os.cpu_count()
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(input_path,)) as pool:
+        results = list(pool.map(_compute, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    elapsed = time.perf_counter() - started
+
+    table = pd.DataFrame([record for record, _, _ in results])
+    size, mtime_ns = source_fingerprint(input_path)
+    table.attrs['source'] = {'path': input_path, 'size': size, 'mtime_ns': mtime_ns,
+                             'version': SNAPSHOT_VERSION}
+    _write(table, output)
+
+    busy = {}
+    for _, pid, seconds in results:
+        busy[pid] = busy.get(pid, 0.0) + seconds
+    return {
+        'snapshots': len(tasks),
+        'workers': workers,
+        'elapsed_s': elapsed,
+        'per_second': len(tasks) / elapsed,
+        'per_second_per_core': len(tasks) / elapsed / workers,
+        'busy_s': busy,
+        'bytes': os.path.getsize(output),
+    }
+
+
+def _write(table, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow = pa.Table.from_pandas(table, preserve_index=False)
+    metadata = dict(arrow.schema.metadata or {})
+    metadata[b'sales_source'] = json.dumps(table.attrs['source']).encode()
+    pq.write_table(arrow.replace_schema_metadata(metadata), path, compression='zstd')
+
+
+class SnapshotStore:
+    """
+    Önceden hesaplanmış sonuçların bellek içi sözlüğü.
+
+    ``get`` ürün × bölge tablosunu ve grafiği döndürür; tablo ve grafik ilk
+    istendiklerinde JSON'dan çözülüp saklanır, sonraki istekler doğrudan sözlükten gelir.
+    """
+
+    def __init__(self, table, source=None):
+        self.source = source or {}
+        self._records = {row.key: row for row in table.itertuples(index=False)}
+        self._decoded = {}
+
+    @classmethod
+    def load(cls, path=SNAPSHOT_PATH, source_path=None):
+        """
+        Dosyayı yükler. Dosya başka bir ``SNAPSHOT_VERSION`` ile yazılmışsa veya
+        ``source_path`` verilip dosya bu kaynaktan (aynı boyut ve değişiklik zamanıyla)
+        üretilmemişse ``None`` döner.
+        """
+        if not os.path.exists(path):
+            return None
+        import pyarrow.parquet as pq
+
+        arrow = pq.read_table(path)
+        source = json.loads((arrow.schema.metadata or {}).get(b'sales_source', b'{}'))
+        if source.get('version') != SNAPSHOT_VERSION:
+            return None
+        if source_path is not None:
+            size, mtime_ns = source_fingerprint(os.path.abspath(source_path))
+            if (source.get('path') != os.path.abspath(source_path)
+                    or (source.get('size'), source.get('mtime_ns')) != (size, mtime_ns)):
+                return None
+        return cls(arrow.to_pandas(), source)
+
+    def __contains__(self, key):
+        return key in self._records
+
+    def __len__(self):
+        return len(self._records)
+
+    def get(self, region, min_revenue):
+        """``{'rows', 'totals', 'figure'}``; kombinasyon saklanmamışsa ``None``."""
+        key = snapshot_key(region, min_revenue)
+        if key not in self._decoded:
+            record = self._records.get(key)
+            if record is None:
+                return None
+            import plotly.io as pio
+
+            self._decoded[key] = {
+                'rows': record.rows,
+                'totals': pd.read_json(io.StringIO(record.totals), orient='split'),
+                'figure': pio.from_json(record.figure),
+            }
+        return self._decoded[key]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dashboard filtre kombinasyonlarını önceden hesaplar")
+    parser.add_argument("--input", default=os.environ.get("SALES_DATA_PATH", "sales_data.csv"),
+                        help="CSV/Parquet/Arrow dosyası, bölümlenmiş klasör veya glob deseni")
+    parser.add_argument("--output", default=SNAPSHOT_PATH, help="Sonuç dosyası (Parquet)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Paralel işçi sayısı (varsayılan: tüm çekirdekler)")
+    args = parser.parse_args(argv)
+
+    stats = precompute(args.input, args.output, args.workers)
+    print(f"✅ {stats['snapshots']} kombinasyon '{args.output}' dosyasına kaydedildi "
+          f"({stats['bytes'] / 1024:,.1f} KB)")
+    print(f"⏱️ {stats['workers']} işçi: {stats['elapsed_s']:.2f} sn, "
+          f"{stats['per_second']:,.1f} kombinasyon/sn, "
+          f"çekirdek başına {stats['per_second_per_core']:,.1f} kombinasyon/sn")
+    for pid, seconds in sorted(stats['busy_s'].items()):
+        print(f"   🔧 işçi {pid}: {seconds:.2f} sn hesaplama")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Büyük tablolar için sunucu tarafı sayfalama
+Filtrelenmiş tablonun tamamı yerine yalnızca görünen sayfa oluşturulup tarayıcıya
+gönderilir; tablo, alttaki verinin satır konumları (row id) üzerinden tanımlanır.
+"""
+
+import numpy as np
+
+# Sayfa başına varsayılan satır sayısı
+DEFAULT_PAGE_SIZE = 50
+
+
+class PagedTable:
+    """
+    Bir DataFrame'in satır konumları üzerinden tanımlanan, tembel sayfalanan görünümü.
+
+    Filtre sonucu kopyalanmaz; yalnızca satır konumları tutulur. Toplam satır ve sayfa
+    sayısı hemen bilinir, ``page()`` yalnızca istenen sayfanın satırlarını ``take`` ile
+    oluşturur. Sıralama sunucu tarafında, konumlar üzerinde yapılır ve sütun/yön başına
+    bir kez hesaplanıp saklanır. Sütun için bir ``SortedIndex`` verilmişse sıralama
+    yeniden yapılmaz; indeksin permütasyonu seçili satırlara süzülür.
+    """
+
+    def __init__(self, df, row_ids=None, page_size=DEFAULT_PAGE_SIZE, sorted_indexes=None):
+        self.df = df
+        self.row_ids = np.arange(len(df)) if row_ids is None else np.asarray(row_ids)
+        self.page_size = page_size
+        self.sorted_indexes = dict(sorted_indexes or {})
+        self._orders = {}
+
+    @property
+    def n_rows(self):
+        """Görünümdeki toplam satır sayısı (satırlar oluşturulmadan)."""
+        return len(self.row_ids)
+
+    @property
+    def n_pages(self):
+        """Toplam sayfa sayısı (boş tabloda 1)."""
+        return max(1, -(-self.n_rows // self.page_size))
+
+    def _ascending(self, column):
+        index = self.sorted_indexes.get(column)
+        if index is not None:
+            selected = np.zeros(index.n_rows, dtype=bool)
+            selected[self.row_ids] = True
+            return index.order[selected[index.order]]
+        values = self.df[column].to_numpy()[self.row_ids]
+        return self.row_ids[np.argsort(values, kind='stable')]
+
+    def ordered_ids(self, sort_by=None, descending=False):
+        """Verilen sütuna göre sıralanmış satır konumları (sütun yoksa filtre sırası)."""
+        if sort_by is None:
+            return self.row_ids
+        key = (sort_by, descending)
+        if key not in self._orders:
+            ascending = self._orders.get((sort_by, False))
+            if ascending is None:
+                ascending = self._orders[(sort_by, False)] = self._ascending(sort_by)
+            self._orders[key] = ascending[::-1] if descending else ascending
+        return self._orders[key]
+
+    def page_ids(self, page, sort_by=None, descending=False):
+        """0 tabanlı ``page`` numaralı sayfanın satır konumları."""
+        page = min(max(page, 0), self.n_pages - 1)
+        start = page * self.page_size
+        return self.ordered_ids(sort_by, descending)[start:start + self.page_size]
+
+    def page(self, page, sort_by=None, descending=False):
+        """İstenen sayfanın DataFrame'i; yalnızca ``page_size`` satır oluşturulur."""
+        return self.df.take(self.page_ids(page, sort_by, descending))
+
+    def caption(self, page):
+        """Sayfa bilgisini gösteren kısa metin."""
+        page = min(max(page, 0), self.n_pages - 1)
+        start = page * self.page_size
+        stop = min(start + self.page_size, self.n_rows)
+        return (f"{self.n_rows:,} satırdan {start + 1 if self.n_rows else 0:,}–{stop:,} "
+                f"arası gösteriliyor (sayfa {page + 1}/{self.n_pages})")
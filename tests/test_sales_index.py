@@ -0,0 +1,72 @@
+"""
+``sales_index`` indekslerinin doğrudan maske ile aynı satırları seçtiğinin kontrolü
+
+Kullanım:
+    python -m pytest -q tests
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sales_index import BitmapIndex, IncrementalFilter, SortedIndex, TrigramIndex  # noqa: E402
+
+
+def _values_with_nan():
+    values = np.arange(1000, dtype=float)
+    values[::100] = np.nan
+    return values
+
+
+@pytest.mark.parametrize('lo, hi', [
+    (990, None),   # seyrek yol
+    (5, None),     # yoğun (maske) yolu
+    (None, 500),
+    (100, 200),
+    (None, None),
+])
+def test_sorted_index_nan_matches_mask(lo, hi):
+    index = SortedIndex(_values_with_nan())
+    expected = np.flatnonzero(index.mask(lo, hi))
+    np.testing.assert_array_equal(index.select(lo, hi), expected)
+    assert index.count(lo, hi) == len(expected)
+    np.testing.assert_array_equal(np.sort(index.row_ids(lo, hi)), expected)
+
+
+def test_incremental_filter_nan_matches_mask():
+    values = _values_with_nan()
+    df = pd.DataFrame({'revenue': values, 'region': np.where(np.arange(1000) % 3, 'A', 'B')})
+    index = SortedIndex(values)
+    engine = IncrementalFilter(df, ranges=['revenue'], categories=['region'],
+                               bitmap_index=BitmapIndex(df, ['region']),
+                               sorted_indexes={'revenue': index})
+    # Slider sürüklemesi: daraltma, genişletme ve baştan hesaplama yollarının hepsi
+    steps = [(0, None), (990, None), (500, ['A']), (400, ['A']), (10, ['A']),
+             (None, ['A']), (None, None), (995, None), (990, ['B']), (0, ['B'])]
+    modes = set()
+    for lo, regions in steps:
+        ids = engine.apply(ranges={'revenue': (lo, None)}, categories={'region': regions})
+        modes.add(engine.last_mode)
+        expected = index.mask(lo)
+        if regions is not None:
+            expected &= df['region'].isin(regions).to_numpy()
+        np.testing.assert_array_equal(ids, np.flatnonzero(expected), err_msg=f"{lo}, {regions}")
+    assert {'full', 'narrow', 'widen'} <= modes
+
+
+def test_trigram_index_chunked_build_matches_single_chunk(monkeypatch):
+    names = ['Ayşe Yılmaz', None, 'AYŞE KAYA', 'Mehmet Öztürk', 'ab', 'Kaya Ayşegül'] * 7
+    single = TrigramIndex(names)
+    monkeypatch.setattr(TrigramIndex, 'BUILD_CHUNK_ROWS', 5)
+    chunked = TrigramIndex(names)
+    np.testing.assert_array_equal(chunked.keys, single.keys)
+    np.testing.assert_array_equal(chunked.offsets, single.offsets)
+    np.testing.assert_array_equal(chunked.postings, single.postings)
+    for pattern in ['ayşe', 'kaya', 'yş', 'öztürk', 'xyz']:
+        expected = [i for i, name in enumerate(names) if pattern in (name or '').casefold()]
+        np.testing.assert_array_equal(chunked.search(pattern), expected)
@@ -0,0 +1,23 @@
+"""
+Hızlı art arda gelen UI değişiklikleri için yardımcılar
+Slider sürüklenirken veya sayı düzenlenirken ara değerlerin her biri için yeniden
+hesaplama yapmak yerine yalnızca son değer (bırakma / Enter / odak kaybı) işlenir.
+``mo.ui.text`` bunu zaten varsayılan olarak yapar (``debounce=True``).
+"""
+
+import marimo as mo
+
+
+def debounced_slider(*args, **kwargs):
+    """
+    Değerini yalnızca sürükleme bırakıldığında gönderen ``mo.ui.slider``.
+    Sürükleme sırasındaki ara değerler tarayıcıda kalır; bağımlı hücreler bir kez çalışır.
+    """
+    kwargs.setdefault('debounce', True)
+    return mo.ui.slider(*args, **kwargs)
+
+
+def debounced_number(*args, **kwargs):
+    """Değerini yalnızca düzenleme bitince gönderen ``mo.ui.number``."""
+    kwargs.setdefault('debounce', True)
+    return mo.ui.number(*args, **kwargs)